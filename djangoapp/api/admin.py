@@ -0,0 +1,73 @@
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import IntegrityError, connections, transaction
+from django.utils.functional import cached_property
+
+from .transicoes import alterar_ativo_em_lote
+
+# Abaixo disso a contagem exata é barata o bastante.
+LIMITE_ESTIMATIVA = 10_000
+
+
+class ContagemEstimadaPaginator(Paginator):
+    """Paginador que usa a estimativa do planejador em listagens sem filtro.
+
+    ``COUNT(*)`` numa tabela grande lê a tabela inteira a cada página do
+    admin; sem filtros o ``reltuples`` do catálogo (somado entre as partições,
+    se houver) é suficiente para numerar as páginas.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return super().count
+
+        conexao = connections[self.object_list.db]
+        if conexao.vendor != 'postgresql':
+            return super().count
+
+        with conexao.cursor() as cursor:
+            cursor.execute("""
+                SELECT CASE WHEN c.relkind = 'p' THEN (
+                    SELECT coalesce(sum(greatest(p.reltuples, 0)), 0)
+                    FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid
+                    WHERE i.inhparent = c.oid
+                ) ELSE greatest(c.reltuples, 0) END::bigint
+                FROM pg_class c WHERE c.oid = %s::regclass
+            """, [self.object_list.model._meta.db_table])
+            estimativa = cursor.fetchone()[0]
+        if estimativa < LIMITE_ESTIMATIVA:
+            return super().count
+        return estimativa
+
+
+class CatalogoAdminMixin:
+    """Listagens paginadas por estimativa e ações de ativar/inativar em lote."""
+
+    paginator = ContagemEstimadaPaginator
+    show_full_result_count = False
+    actions = ['ativar_selecionados', 'inativar_selecionados']
+
+    @admin.action(description='Ativar selecionados')
+    def ativar_selecionados(self, request, queryset):
+        self._alterar_ativo(request, queryset, True)
+
+    @admin.action(description='Inativar selecionados')
+    def inativar_selecionados(self, request, queryset):
+        self._alterar_ativo(request, queryset, False)
+
+    def _alterar_ativo(self, request, queryset, ativo):
+        try:
+            with transaction.atomic(using=queryset.db):
+                alterados = alterar_ativo_em_lote(queryset, ativo)
+        except ValidationError as exc:
+            self.message_user(request, ' '.join(exc.messages), messages.ERROR)
+            return
+        except IntegrityError as exc:
+            self.message_user(request, str(exc).splitlines()[0], messages.ERROR)
+            return
+
+        acao = 'ativado(s)' if ativo else 'inativado(s)'
+        self.message_user(request, f'{len(alterados)} registro(s) {acao}.', messages.SUCCESS)
@@ -0,0 +1,157 @@
+import re
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+from .invalidacao import barramento_ativo, registrar
+
+# Palavras do nome indexadas além da primeira (já coberta pelo nome inteiro).
+PALAVRAS = 8
+
+_separador = re.compile(r'[^0-9a-z]+')
+
+
+def dobrar(texto):
+    """Minúsculas sem acentos: ``'Cálculo I'`` vira ``'calculo i'``."""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+class IndicePrefixos:
+    """Índice de prefixos em memória sobre ``codigo`` e ``nome`` dos ativos.
+
+    São três listas ordenadas de ``(chave, pk)``, consultadas nesta ordem de
+    relevância: código, nome inteiro e demais palavras do nome. A busca é uma
+    bisseção por lista e para ao juntar ``limite`` registros. É montado na
+    primeira consulta e atualizado a partir do barramento de invalidação: os
+    pks alterados são relidos na consulta seguinte. Sem o barramento ativo,
+    as escritas de outros workers não chegam aqui, então o índice é remontado
+    a cada ``AUTOCOMPLETAR['TTL']`` segundos. Acima de ``MAXIMO_REGISTROS`` o
+    índice não é montado e ``buscar`` devolve ``None``; essa decisão vale pelo
+    mesmo TTL, sem um ``COUNT`` a cada consulta.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+        self.registros = None
+        self.listas = ([], [], [])
+        self.sujos = set()
+        self.validade = None
+        self.recusado_ate = 0
+
+    def _chaves(self, codigo, nome):
+        nome = dobrar(nome)
+        # Palavras se repetem entre nomes: uma só cópia de cada na memória.
+        palavras = [sys.intern(p) for p in _separador.split(nome) if p][1:PALAVRAS + 1]
+        return dobrar(codigo), nome, palavras
+
+    def _inserir(self, pk, codigo, nome):
+        chave_codigo, chave_nome, palavras = self._chaves(codigo, nome)
+        self.registros[pk] = (codigo, nome)
+        insort(self.listas[0], (chave_codigo, pk))
+        insort(self.listas[1], (chave_nome, pk))
+        for palavra in palavras:
+            insort(self.listas[2], (palavra, pk))
+
+    def _remover(self, pk):
+        registro = self.registros.pop(pk, None)
+        if registro is None:
+            return
+        chave_codigo, chave_nome, palavras = self._chaves(*registro)
+        for lista, chaves in zip(self.listas, ([chave_codigo], [chave_nome], palavras)):
+            for chave in chaves:
+                posicao = bisect_left(lista, (chave, pk))
+                if posicao < len(lista) and lista[posicao] == (chave, pk):
+                    del lista[posicao]
+
+    def _montar(self):
+        ativos = self.model._default_manager.filter(ativo=True)
+        if ativos.count() > settings.AUTOCOMPLETAR['MAXIMO_REGISTROS']:
+            return False
+        self.registros, self.sujos = {}, set()
+        listas = ([], [], [])
+        for pk, codigo, nome in ativos.values_list('pk', 'codigo', 'nome').iterator(chunk_size=5000):
+            chave_codigo, chave_nome, palavras = self._chaves(codigo, nome)
+            self.registros[pk] = (codigo, nome)
+            listas[0].append((chave_codigo, pk))
+            listas[1].append((chave_nome, pk))
+            listas[2].extend((palavra, pk) for palavra in palavras)
+        for lista in listas:
+            lista.sort()
+        self.listas = listas
+        if not barramento_ativo():
+            self.validade = time.monotonic() + settings.AUTOCOMPLETAR['TTL']
+        return True
+
+    def _atualizar(self):
+        sujos, self.sujos = self.sujos, set()
+        atuais = {
+            pk: (codigo, nome)
+            for pk, codigo, nome in self.model._default_manager.filter(
+                pk__in=sujos, ativo=True
+            ).values_list('pk', 'codigo', 'nome')
+        }
+        for pk in sujos:
+            self._remover(pk)
+            if pk in atuais:
+                self._inserir(pk, *atuais[pk])
+
+    def buscar(self, termo, limite):
+        """Até ``limite`` registros ``(pk, codigo, nome)`` cujo código ou nome
+        (ou uma palavra do nome) começa com ``termo``."""
+        prefixo = dobrar(termo).strip()
+        agora = time.monotonic()
+        with self.lock:
+            if self.validade is not None and agora > self.validade:
+                self.registros, self.validade = None, None
+            if self.registros is None:
+                if agora < self.recusado_ate:
+                    return None
+                if not self._montar():
+                    self.recusado_ate = agora + settings.AUTOCOMPLETAR['TTL']
+                    return None
+            if self.sujos:
+                self._atualizar()
+            encontrados = {}
+            for lista in self.listas:
+                posicao = bisect_left(lista, (prefixo,))
+                while posicao < len(lista) and len(encontrados) < limite:
+                    chave, pk = lista[posicao]
+                    if not chave.startswith(prefixo):
+                        break
+                    encontrados.setdefault(pk, None)
+                    posicao += 1
+            return [(pk, *self.registros[pk]) for pk in encontrados]
+
+    def marcar(self, pk):
+        with self.lock:
+            if self.registros is not None:
+                self.sujos.add(self.model._meta.pk.to_python(pk))
+
+    def descartar(self):
+        with self.lock:
+            self.registros = None
+            self.listas = ([], [], [])
+            self.sujos = set()
+            self.validade = None
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+
+
+def get_indice(model, recurso):
+    indice = _indices.get(recurso)
+    if indice is None:
+        with _indices_lock:
+            indice = _indices.get(recurso)
+            if indice is None:
+                indice = IndicePrefixos(model)
+                registrar(recurso, indice.marcar, indice.descartar)
+                _indices[recurso] = indice
+    return indice
@@ -0,0 +1,78 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.serializers import BaseSerializer
+
+
+def _leituras(model, campo, prefixo=''):
+    """Colunas (em notação ``only()``) e joins lidos por um campo do serializer.
+
+    Devolve ``None`` quando o campo lê algo que não é uma coluna do model
+    (propriedades, ``source='*'``...), caso em que não dá para projetar.
+    """
+    if campo.source == '*':
+        return None
+    colunas, joins = set(), set()
+    atual, caminho = model, prefixo
+    partes = campo.source_attrs
+    for i, parte in enumerate(partes):
+        try:
+            field = atual._meta.get_field(parte)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.many_to_many:
+            return None
+        caminho = f'{caminho}__{parte}' if caminho else parte
+        colunas.add(caminho)
+        ultima = i == len(partes) - 1
+        if not field.is_relation:
+            if not ultima:
+                return None
+            continue
+        if ultima and not isinstance(campo, BaseSerializer):
+            continue
+        joins.add(caminho)
+        atual = field.related_model
+        if ultima:
+            for filho in campo.fields.values():
+                if filho.write_only:
+                    continue
+                leituras = _leituras(atual, filho, caminho)
+                if leituras is None:
+                    return None
+                colunas |= leituras[0]
+                joins |= leituras[1]
+    return colunas, joins
+
+
+def projetar(queryset, campos, anotacoes=None):
+    """Restringe o queryset ao que os campos do serializer leem.
+
+    Colunas viram ``only()``, relações percorridas viram ``select_related()``
+    e os campos listados em ``anotacoes`` aplicam o método do queryset (nome
+    ou função que recebe o queryset) que os calcula, uma vez por método. Se
+    algum campo ler algo desconhecido, apenas os joins e anotações são
+    aplicados.
+    """
+    anotacoes = anotacoes or {}
+    colunas, joins, metodos = {queryset.model._meta.pk.name}, set(), []
+    projetavel = True
+    for nome, campo in campos.items():
+        if campo.write_only:
+            continue
+        if nome in anotacoes:
+            if anotacoes[nome] not in metodos:
+                metodos.append(anotacoes[nome])
+            continue
+        leituras = _leituras(queryset.model, campo)
+        if leituras is None:
+            projetavel = False
+            continue
+        colunas |= leituras[0]
+        joins |= leituras[1]
+
+    for metodo in metodos:
+        queryset = metodo(queryset) if callable(metodo) else getattr(queryset, metodo)()
+    if joins:
+        queryset = queryset.select_related(*sorted(joins))
+    if projetavel:
+        queryset = queryset.only(*sorted(colunas))
+    return queryset
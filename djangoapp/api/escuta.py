@@ -0,0 +1,76 @@
+import logging
+import select
+import threading
+import time
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Só depois de tanto tempo conectado uma queda volta a reconectar de imediato.
+ESTAVEL_APOS = 60
+
+
+class OuvintePostgres(threading.Thread):
+    """Thread que faz ``LISTEN`` num canal e reconecta com backoff.
+
+    Subclasses implementam ``receber(payload)`` e, se precisarem reagir a
+    notificações perdidas enquanto desconectadas, ``conectado(primeira)``.
+    """
+
+    daemon = True
+
+    def __init__(self, canal, name, using='default'):
+        super().__init__(name=name)
+        self.canal = canal
+        self.using = using
+        self.conexao = None
+
+    def conectado(self, primeira):
+        pass
+
+    def receber(self, payload):
+        raise NotImplementedError
+
+    def _conectar(self):
+        wrapper = connections[self.using]
+        conexao = wrapper.get_new_connection(wrapper.get_connection_params())
+        conexao.autocommit = True
+        with conexao.cursor() as cursor:
+            cursor.execute(f'LISTEN {wrapper.ops.quote_name(self.canal)}')
+        return conexao
+
+    def run(self):
+        espera = 1
+        primeira = True
+        while True:
+            try:
+                conexao = self._conectar()
+            except Exception:
+                logger.exception('Falha ao escutar o canal %s', self.canal)
+                time.sleep(espera)
+                espera = min(espera * 2, 30)
+                continue
+
+            self.conexao = conexao
+            self.conectado(primeira)
+            primeira = False
+            inicio = time.monotonic()
+            try:
+                while True:
+                    if select.select([conexao], [], [], 30) == ([], [], []):
+                        continue
+                    conexao.poll()
+                    while conexao.notifies:
+                        self.receber(conexao.notifies.pop(0).payload)
+            except Exception:
+                logger.exception('Canal %s desconectado', self.canal)
+                try:
+                    conexao.close()
+                except Exception:
+                    pass
+            if time.monotonic() - inicio >= ESTAVEL_APOS:
+                espera = 1
+            else:
+                time.sleep(espera)
+                espera = min(espera * 2, 30)
@@ -0,0 +1,12 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import exception_handler
+
+
+def tratar_excecao(exc, context):
+    """Converte ``ValidationError`` do Django (vinda do ``save()``) em 400."""
+    if isinstance(exc, DjangoValidationError):
+        exc = ValidationError(
+            exc.message_dict if hasattr(exc, 'error_dict') else exc.messages
+        )
+    return exception_handler(exc, context)
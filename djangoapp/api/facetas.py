@@ -0,0 +1,82 @@
+import threading
+
+from django.db import connections
+from django.db.models import Count, F
+
+from .invalidacao import RECURSOS, registrar
+
+_geracao = 0
+_geracao_lock = threading.Lock()
+_registrada = False
+
+
+def _avancar(*args):
+    global _geracao
+    with _geracao_lock:
+        _geracao += 1
+
+
+def geracao():
+    """Número que muda a cada invalidação do barramento, de qualquer recurso.
+
+    Entra na chave do cache das facetas: uma escrita em qualquer worker torna
+    as contagens guardadas inalcançáveis, sem esperar o TTL.
+    """
+    global _registrada
+    if not _registrada:
+        with _geracao_lock:
+            if not _registrada:
+                for recurso in set(RECURSOS.values()):
+                    registrar(recurso, _avancar, _avancar)
+                _registrada = True
+    return _geracao
+
+
+def contar_facetas(queryset, dimensoes):
+    """Conta o queryset por cada dimensão e no total.
+
+    No PostgreSQL é uma única consulta com ``GROUPING SETS``: um conjunto por
+    dimensão mais o conjunto vazio para o total. Devolve ``(total,
+    {dimensao: [(valor, total), ...]})`` com os valores mais frequentes antes.
+    """
+    queryset = queryset.order_by()
+    conexao = connections[queryset.db]
+    if conexao.vendor != 'postgresql':
+        contagens = {
+            dimensao: list(queryset.values_list(dimensao).annotate(total=Count('pk')))
+            for dimensao in dimensoes
+        }
+        return queryset.count(), _ordenar(contagens)
+
+    colunas = {f'faceta_{i}': F(dimensao) for i, dimensao in enumerate(dimensoes)}
+    sql, params = queryset.values(**colunas).query.get_compiler(queryset.db).as_sql()
+    nomes = ', '.join(colunas)
+    conjuntos = ', '.join(f'({nome})' for nome in colunas)
+    with conexao.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {nomes}, GROUPING({nomes}), count(*) FROM ({sql}) AS f '
+            f'GROUP BY GROUPING SETS ({conjuntos}, ())',
+            params,
+        )
+        linhas = cursor.fetchall()
+
+    total = 0
+    contagens = {dimensao: [] for dimensao in dimensoes}
+    ultimo_bit = len(dimensoes) - 1
+    for linha in linhas:
+        *valores, agrupamento, quantidade = linha
+        for i, dimensao in enumerate(dimensoes):
+            # GROUPING() liga o bit das colunas que ficaram fora do conjunto.
+            if not agrupamento & (1 << (ultimo_bit - i)):
+                contagens[dimensao].append((valores[i], quantidade))
+                break
+        else:
+            total = quantidade
+    return total, _ordenar(contagens)
+
+
+def _ordenar(contagens):
+    return {
+        dimensao: sorted(valores, key=lambda item: (-item[1], str(item[0])))
+        for dimensao, valores in contagens.items()
+    }
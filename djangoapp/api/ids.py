@@ -0,0 +1,35 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_ultimo_ms = 0
+_contador = 0
+
+
+def uuid7():
+    """Gera um UUID versão 7 (RFC 9562), ordenado pelo horário de criação.
+
+    Os 48 bits iniciais são o timestamp Unix em milissegundos e os 12 bits de
+    ``rand_a`` funcionam como contador dentro do mesmo milissegundo, então ids
+    gerados no processo são estritamente crescentes. O formato continua sendo
+    um UUID comum e convive com os ids v4 já existentes.
+    """
+    global _ultimo_ms, _contador
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _ultimo_ms:
+            _ultimo_ms = ms
+            _contador = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        else:
+            _contador += 1
+            if _contador > 0xFFF:
+                _ultimo_ms += 1
+                _contador = 0
+        ms, contador = _ultimo_ms, _contador
+
+    aleatorio = int.from_bytes(os.urandom(8), 'big') & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=(
+        ms << 80 | 0x7 << 76 | contador << 64 | 0b10 << 62 | aleatorio
+    ))
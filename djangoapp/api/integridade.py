@@ -0,0 +1,30 @@
+from django.db import IntegrityError, connections, router, transaction
+
+
+class RestricoesMixin:
+    """Deixa unicidade e regras de negócio a cargo das restrições do banco.
+
+    No PostgreSQL o ``save()`` grava direto, dentro de um savepoint; só quando
+    o banco recusa a escrita com ``IntegrityError`` é que
+    ``validar_restricoes()`` roda as checagens em Python para devolver a
+    mensagem de erro de sempre. Nos demais bancos, sem os triggers, as
+    checagens continuam rodando antes da escrita.
+    """
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        if connections[using].vendor != 'postgresql':
+            self.validar_restricoes()
+            return super().save(*args, **kwargs)
+
+        try:
+            with transaction.atomic(using=using):
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            self.validar_restricoes()
+            raise
+
+    def validar_restricoes(self):
+        self.validate_unique()
+        self.validate_constraints()
+        self.clean()
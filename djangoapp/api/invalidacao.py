@@ -0,0 +1,165 @@
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .escuta import OuvintePostgres
+
+logger = logging.getLogger(__name__)
+
+RECURSOS = {
+    'cursos.Curso': 'cursos',
+    'disciplinas.Disciplina': 'disciplinas',
+    'perfis.Perfil': 'perfis',
+}
+
+# Cabe folgado no limite de 8000 bytes do payload do NOTIFY.
+IDS_POR_MENSAGEM = 150
+
+_caches = {}
+_local = threading.local()
+
+
+def barramento_ativo():
+    return settings.INVALIDACAO['ATIVO']
+
+
+def registrar(recurso, remover, limpar):
+    """Liga um cache local ao barramento: ``remover(pk)`` e ``limpar()``."""
+    _caches.setdefault(recurso, []).append((remover, limpar))
+    iniciar_ouvinte()
+
+
+def publicar(recurso, pk, using='default'):
+    """Invalida ``pk`` de ``recurso`` em todos os workers após o commit."""
+    pendentes = getattr(_local, 'pendentes', None)
+    if pendentes is not None:
+        ids = pendentes.setdefault((using, recurso), set())
+        if ids is not None:
+            ids.add(str(pk))
+        return
+    transaction.on_commit(partial(_enviar, using, recurso, [str(pk)]), using=using, robust=True)
+
+
+def publicar_tudo(recurso, using='default'):
+    """Esvazia os caches de ``recurso`` em todos os workers após o commit."""
+    pendentes = getattr(_local, 'pendentes', None)
+    if pendentes is not None:
+        pendentes[using, recurso] = None
+        return
+    transaction.on_commit(partial(_enviar, using, recurso, None), using=using, robust=True)
+
+
+@contextmanager
+def agrupar():
+    """Junta as invalidações do bloco em poucas mensagens (escritas em lote)."""
+    if getattr(_local, 'pendentes', None) is not None:
+        yield
+        return
+    _local.pendentes = {}
+    try:
+        yield
+    finally:
+        pendentes, _local.pendentes = _local.pendentes, None
+        for (using, recurso), ids in pendentes.items():
+            transaction.on_commit(
+                partial(_enviar, using, recurso, sorted(ids) if ids is not None else None),
+                using=using, robust=True,
+            )
+
+
+def _enviar(using, recurso, ids):
+    if ids is not None and len(ids) > settings.INVALIDACAO['MAXIMO_IDS']:
+        ids = None
+    if ids is None:
+        mensagens = [{'r': recurso}]
+    else:
+        mensagens = [
+            {'r': recurso, 'ids': ids[inicio:inicio + IDS_POR_MENSAGEM]}
+            for inicio in range(0, len(ids), IDS_POR_MENSAGEM)
+        ]
+    for mensagem in mensagens:
+        aplicar(mensagem)
+
+    if not barramento_ativo() or connections[using].vendor != 'postgresql':
+        return
+    with connections[using].cursor() as cursor:
+        for mensagem in mensagens:
+            cursor.execute('SELECT pg_notify(%s, %s)', [
+                settings.INVALIDACAO['CANAL'], json.dumps(mensagem, separators=(',', ':')),
+            ])
+
+
+def aplicar(mensagem):
+    for remover, limpar in _caches.get(mensagem['r'], ()):
+        if 'ids' in mensagem:
+            for pk in mensagem['ids']:
+                remover(pk)
+        else:
+            limpar()
+
+
+def limpar_tudo():
+    for caches in _caches.values():
+        for _, limpar in caches:
+            limpar()
+
+
+class OuvinteInvalidacao(OuvintePostgres):
+    """Aplica nos caches locais as invalidações publicadas pelos outros workers."""
+
+    def __init__(self, using='default'):
+        super().__init__(settings.INVALIDACAO['CANAL'], 'invalidacao-postgres', using)
+
+    def conectado(self, primeira):
+        # Sem garantia de que nada foi perdido antes de (re)conectar.
+        limpar_tudo()
+
+    def receber(self, payload):
+        try:
+            aplicar(json.loads(payload))
+        except (ValueError, KeyError, TypeError):
+            logger.warning('Mensagem de invalidação inválida: %r', payload)
+
+
+_ouvinte = None
+_ouvinte_lock = threading.Lock()
+
+
+def get_ouvinte():
+    return _ouvinte
+
+
+def iniciar_ouvinte():
+    global _ouvinte
+    if _ouvinte is not None or not barramento_ativo():
+        return
+    if connections['default'].vendor != 'postgresql':
+        return
+    with _ouvinte_lock:
+        if _ouvinte is None:
+            _ouvinte = OuvinteInvalidacao()
+            _ouvinte.start()
+
+
+@receiver(post_save)
+def publicar_save(sender, instance, raw, using, update_fields, **kwargs):
+    recurso = RECURSOS.get(sender._meta.label)
+    if recurso is None or raw:
+        return
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    publicar(recurso, instance.pk, using)
+
+
+@receiver(post_delete)
+def publicar_delete(sender, instance, using, **kwargs):
+    recurso = RECURSOS.get(sender._meta.label)
+    if recurso is not None:
+        publicar(recurso, instance.pk, using)
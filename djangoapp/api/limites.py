@@ -0,0 +1,145 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+PERIODOS = {'s': 1, 'min': 60, 'h': 3600, 'dia': 86400}
+
+
+def interpretar_taxa(taxa):
+    """``'60/min'`` -> (intervalo entre requisições, tolerância de rajada)."""
+    quantidade, periodo = taxa.split('/')
+    periodo = PERIODOS[periodo]
+    intervalo = periodo / int(quantidade)
+    return intervalo, periodo - intervalo
+
+
+class EstadoMemoria:
+    """TATs do GCRA em memória do processo: um dict e um lock, sem I/O.
+
+    O dict é um LRU limitado a ``maximo`` chaves; ao estourar, as menos
+    usadas saem até sobrar ``minimo``. Uma chave despejada volta como
+    ausente, o que só pode liberar uma requisição a mais.
+    """
+
+    relogio = staticmethod(time.monotonic)
+
+    def __init__(self, maximo=100_000, minimo=None):
+        self.maximo = maximo
+        self.minimo = minimo if minimo is not None else maximo * 9 // 10
+        self._tat = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consumir(self, chave, intervalo, tolerancia):
+        agora = self.relogio()
+        with self._lock:
+            tat = max(self._tat.get(chave, agora), agora)
+            espera = tat - tolerancia - agora
+            if espera > 0:
+                return espera
+            self._tat[chave] = tat + intervalo
+            self._tat.move_to_end(chave)
+            if len(self._tat) > self.maximo:
+                while len(self._tat) > self.minimo:
+                    self._tat.popitem(last=False)
+        return 0.0
+
+
+class EstadoCache:
+    """TATs no cache do Django, compartilhados entre processos.
+
+    Um GET e, se liberado, um SET por requisição; uma corrida entre dois
+    processos pode deixar passar uma requisição a mais, nunca bloquear.
+    """
+
+    relogio = staticmethod(time.time)
+
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def consumir(self, chave, intervalo, tolerancia):
+        agora = self.relogio()
+        chave = f'gcra:{chave}'
+        tat = max(self.cache.get(chave, agora), agora)
+        espera = tat - tolerancia - agora
+        if espera > 0:
+            return espera
+        self.cache.set(chave, tat + intervalo, timeout=math.ceil(tat + intervalo - agora))
+        return 0.0
+
+
+class Limites:
+    def __init__(self, config):
+        self.taxas = {
+            escopo: {
+                tipo: interpretar_taxa(taxa) if taxa else None
+                for tipo, taxa in taxas.items()
+            }
+            for escopo, taxas in config['TAXAS'].items()
+        }
+        if config['ESTADO'] == 'cache':
+            self.estado = EstadoCache(config['CACHE'])
+        else:
+            self.estado = EstadoMemoria()
+
+    def taxa(self, escopo, tipo):
+        taxas = self.taxas.get(escopo)
+        if taxas is not None and tipo in taxas:
+            return taxas[tipo]
+        return self.taxas['padrao'].get(tipo)
+
+
+_limites = None
+_limites_lock = threading.Lock()
+
+
+def get_limites():
+    global _limites
+    if _limites is None:
+        with _limites_lock:
+            if _limites is None:
+                _limites = Limites(settings.LIMITES)
+    return _limites
+
+
+def escopo(request, view):
+    """``<basename>.<ação>`` nos ViewSets; nome da rota nas demais views."""
+    basename = getattr(view, 'basename', None)
+    if basename is not None:
+        return f'{basename}.{view.action}'
+    resolver_match = getattr(request, 'resolver_match', None)
+    return resolver_match.url_name if resolver_match is not None else ''
+
+
+class GCRAThrottle(BaseThrottle):
+    """Limite de taxa por usuário e escopo com GCRA.
+
+    As taxas vêm de ``settings.LIMITES['TAXAS']``, por escopo e por ``tipo``
+    do perfil (``anonimo`` para requisições sem usuário); o que não estiver
+    no escopo cai em ``padrao``. Cada chave guarda um único número, o
+    instante teórico da próxima chegada (TAT).
+    """
+
+    def get_limites(self):
+        return get_limites()
+
+    def allow_request(self, request, view):
+        limites = self.get_limites()
+        user = request.user
+        autenticado = user is not None and user.is_authenticated
+        tipo = getattr(user, 'tipo', '') if autenticado else 'anonimo'
+        nome = escopo(request, view)
+
+        taxa = limites.taxa(nome, tipo)
+        if taxa is None:
+            return True
+        ident = user.pk if autenticado else self.get_ident(request)
+        self.espera = limites.estado.consumir(f'{nome}:{ident}', *taxa)
+        return self.espera <= 0
+
+    def wait(self):
+        return self.espera
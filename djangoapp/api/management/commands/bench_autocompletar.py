@@ -0,0 +1,80 @@
+import itertools
+import time
+import tracemalloc
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from api.autocompletar import IndicePrefixos
+from cursos.models import Curso
+from perfis.models import Perfil
+
+PALAVRAS = [
+    'Cálculo', 'Álgebra', 'Física', 'Programação', 'Introdução', 'Engenharia',
+    'Análise', 'Estruturas', 'Química', 'Geometria', 'Computação', 'Estatística',
+]
+
+PREFIXOS = ['c', 'calc', 'prog', 'ALG', 'introducao a']
+
+
+class Command(BaseCommand):
+    help = 'Compara o autocomplete em memória com a busca do SearchFilter (tudo é desfeito ao final).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cursos', type=int, default=20_000)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sufixo = uuid.uuid4().hex[:8].upper()
+        nomes = itertools.cycle(
+            ' '.join(combinacao) for combinacao in itertools.permutations(PALAVRAS, 3)
+        )
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            gerente = Perfil(nome='Bench', tipo='Gerente', email=f'bench{sufixo}@bench.local')
+            gerente.save()
+            Curso.objects.bulk_create([
+                Curso(codigo=f'B{sufixo}{i}', nome=next(nomes), carga_horaria_total=100)
+                for i in range(options['cursos'])
+            ], batch_size=2000)
+
+            indice = IndicePrefixos(Curso)
+            tracemalloc.start()
+            indice.buscar('', 1)
+            memoria = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            indice.descartar()
+            montagem = self.medir(lambda: indice.buscar('', 1), 1)
+            self.stdout.write(
+                f'índice: {len(indice.registros)} cursos, {sum(map(len, indice.listas))} chaves, '
+                f'{memoria / 1024 / 1024:.1f} MiB, montado em {montagem * 1000:.0f} ms'
+            )
+
+            cliente = APIClient()
+            cliente.force_authenticate(gerente)
+            cliente.get('/cursos/autocomplete/', {'q': 'a'})
+            self.stdout.write(f'\n{"prefixo":14} {"índice":>10} {"autocomplete":>13} {"?search=":>10}')
+            for prefixo in PREFIXOS:
+                direto = self.medir(lambda: indice.buscar(prefixo, 10), options['repeticoes'])
+                endpoint = self.medir(
+                    lambda: cliente.get('/cursos/autocomplete/', {'q': prefixo}),
+                    options['repeticoes'],
+                )
+                busca = self.medir(
+                    lambda: cliente.get('/cursos/', {'search': prefixo}), options['repeticoes']
+                )
+                self.stdout.write(
+                    f'{prefixo!r:14} {direto * 1000:8.3f}ms {endpoint * 1000:11.2f}ms '
+                    f'{busca * 1000:8.2f}ms'
+                )
+            transaction.set_rollback(True)
+
+    def medir(self, funcao, repeticoes):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        return sorted(tempos)[len(tempos) // 2]
@@ -0,0 +1,68 @@
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from perfis.models import Perfil
+
+SAVEPOINTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+class Command(BaseCommand):
+    help = 'Conta as consultas SQL de cada endpoint de escrita (tudo é desfeito ao final).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sql', action='store_true', help='Lista as consultas de cada endpoint.')
+
+    def handle(self, *args, **options):
+        sufixo = uuid.uuid4().hex[:8].upper()
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            gerente = Perfil(nome='Bench', tipo='Gerente', email=f'bench{sufixo}@bench.local')
+            gerente.save()
+            cliente = APIClient(raise_request_exception=False)
+            cliente.force_authenticate(gerente)
+            self.cliente, self.ids, self.sql = cliente, {}, options['sql']
+
+            self.medir('POST /cursos/', 'post', '/cursos/', {
+                'codigo': f'C{sufixo}', 'nome': 'Curso', 'carga_horaria_total': 100,
+            }, guardar='curso')
+            self.medir('PATCH /cursos/{id}/', 'patch', '/cursos/{curso}/', {'nome': 'Curso 2'})
+            self.medir('POST /cursos/ (código duplicado)', 'post', '/cursos/', {
+                'codigo': f'C{sufixo}', 'nome': 'Curso', 'carga_horaria_total': 100,
+            })
+            self.medir('POST /disciplinas/', 'post', '/disciplinas/', {
+                'codigo': f'D{sufixo}', 'nome': 'Disciplina', 'carga_horaria': 60,
+                'curso': '{curso}',
+            }, guardar='disciplina')
+            self.medir('PATCH /disciplinas/{id}/', 'patch', '/disciplinas/{disciplina}/', {
+                'carga_horaria': 80,
+            })
+            self.medir('POST /disciplinas/ (carga excedida)', 'post', '/disciplinas/', {
+                'codigo': f'E{sufixo}', 'nome': 'Disciplina', 'carga_horaria': 40,
+                'curso': '{curso}',
+            })
+            self.medir('PATCH /disciplinas/{id}/inativar/', 'patch', '/disciplinas/{disciplina}/inativar/')
+            self.medir('PATCH /disciplinas/{id}/ativar/', 'patch', '/disciplinas/{disciplina}/ativar/')
+            self.medir('POST /perfis/', 'post', '/perfis/', {
+                'nome': 'Professor', 'tipo': 'Professor', 'email': f'p{sufixo}@bench.local',
+                'password': 'senha-bench',
+            })
+            transaction.set_rollback(True)
+
+    def medir(self, nome, metodo, url, dados=None, guardar=None):
+        url = url.format(**self.ids)
+        if dados:
+            dados = {k: v.format(**self.ids) if isinstance(v, str) else v for k, v in dados.items()}
+        with CaptureQueriesContext(connection) as contexto:
+            resposta = getattr(self.cliente, metodo)(url, dados, format='json')
+        consultas = [
+            q['sql'] for q in contexto.captured_queries if not q['sql'].startswith(SAVEPOINTS)
+        ]
+        if guardar:
+            self.ids[guardar] = resposta.data['id']
+        self.stdout.write(f'{nome:40} {resposta.status_code}  {len(consultas):3} consultas')
+        if self.sql:
+            for sql in consultas:
+                self.stdout.write(f'    {sql[:160]}')
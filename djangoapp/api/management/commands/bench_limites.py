@@ -0,0 +1,60 @@
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from rest_framework.throttling import UserRateThrottle
+
+from api.limites import EstadoMemoria, GCRAThrottle, Limites
+
+
+class DRFUserRateThrottle(UserRateThrottle):
+    rate = '1000000/min'
+
+
+class Command(BaseCommand):
+    help = 'Mede o custo por requisição (µs) do GCRA x UserRateThrottle do DRF.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requisicoes', type=int, default=100_000)
+        parser.add_argument('--usuarios', type=int, default=1_000)
+
+    def handle(self, *args, **options):
+        usuarios = [
+            SimpleNamespace(pk=i, tipo='Professor', is_authenticated=True)
+            for i in range(options['usuarios'])
+        ]
+        requisicoes = [
+            SimpleNamespace(user=usuarios[i % len(usuarios)], META={}, resolver_match=None)
+            for i in range(options['requisicoes'])
+        ]
+        view = SimpleNamespace(basename='disciplina', action='list')
+        config = {'TAXAS': {'padrao': {'Professor': '1000000/min'}}, 'CACHE': 'default'}
+
+        throttles = {'DRF UserRateThrottle': DRFUserRateThrottle}
+        for nome, estado in (('GCRA memória', 'memoria'), ('GCRA cache', 'cache')):
+            limites = Limites({**config, 'ESTADO': estado})
+            throttles[nome] = type('Throttle', (GCRAThrottle,), {
+                'get_limites': lambda self, limites=limites: limites,
+            })
+
+        DRFUserRateThrottle.cache.clear()
+        for nome, classe in throttles.items():
+            inicio = time.perf_counter()
+            negadas = 0
+            for request in requisicoes:
+                if not classe().allow_request(request, view):
+                    negadas += 1
+            duracao = time.perf_counter() - inicio
+            self.stdout.write(
+                f'{nome:22} {duracao / len(requisicoes) * 1e6:8.2f} µs/requisição'
+                f'  ({negadas} negadas)'
+            )
+
+        estado = EstadoMemoria()
+        inicio = time.perf_counter()
+        for i in range(options['requisicoes']):
+            estado.consumir(i % options['usuarios'], 0.06, 59.94)
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(
+            f'{"só o estado em memória":22} {duracao / options["requisicoes"] * 1e6:8.2f} µs/operação'
+        )
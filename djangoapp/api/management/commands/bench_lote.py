@@ -0,0 +1,61 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from cursos.models import Curso
+from disciplinas.models import Disciplina
+from perfis.models import Perfil
+
+
+class Command(BaseCommand):
+    help = 'Compara N retrieves de disciplinas com uma leitura em lote (tudo é desfeito ao final).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ids', type=int, default=50)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sufixo = uuid.uuid4().hex[:8].upper()
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            gerente = Perfil(nome='Bench', tipo='Gerente', email=f'bench{sufixo}@bench.local')
+            gerente.save()
+            cursos = Curso.objects.bulk_create([
+                Curso(codigo=f'C{sufixo}{i}', nome=f'Curso {i}', carga_horaria_total=1000)
+                for i in range(10)
+            ])
+            disciplinas = Disciplina.objects.bulk_create([
+                Disciplina(
+                    codigo=f'D{sufixo}{i}', nome=f'Disciplina {i}', carga_horaria=10,
+                    curso=cursos[i % len(cursos)],
+                )
+                for i in range(options['ids'])
+            ])
+            ids = [str(disciplina.pk) for disciplina in disciplinas]
+            cliente = APIClient()
+            cliente.force_authenticate(gerente)
+
+            def individuais():
+                for pk in ids:
+                    cliente.get(f'/disciplinas/{pk}/')
+
+            def lote():
+                cliente.post('/disciplinas/batch/', {'ids': ids}, format='json')
+
+            self.stdout.write(f'{len(ids)} disciplinas')
+            for nome, funcao in (('retrieves individuais', individuais), ('batch', lote)):
+                tempo, consultas = self.medir(funcao, options['repeticoes'])
+                self.stdout.write(f'  {nome:22} {tempo:9.2f} ms  {consultas:4} consultas')
+            transaction.set_rollback(True)
+
+    def medir(self, funcao, repeticoes):
+        tempos = []
+        for _ in range(repeticoes):
+            with CaptureQueriesContext(connection) as contexto:
+                inicio = time.perf_counter()
+                funcao()
+                tempos.append((time.perf_counter() - inicio) * 1000)
+        return sorted(tempos)[len(tempos) // 2], len(contexto.captured_queries)
@@ -0,0 +1,73 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.middleware import GzipCompressor, brotli, comprimir
+from api.renderers import MessagePackRenderer, ORJSONRenderer, msgpack, orjson
+from cursos.models import Curso
+from disciplinas.models import Disciplina
+from disciplinas.serializers import DisciplinaListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compara custo de serialização e tamanho do payload por renderer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paginas', type=int, nargs='+', default=[20, 100, 1000])
+        parser.add_argument('--repeticoes', type=int, default=200)
+
+    def handle(self, *args, **options):
+        renderers = {'json (DRF)': JSONRenderer()}
+        if orjson is not None:
+            renderers['orjson'] = ORJSONRenderer()
+        if msgpack is not None:
+            renderers['msgpack'] = MessagePackRenderer()
+
+        for tamanho in options['paginas']:
+            dados = self.pagina(tamanho)
+            repeticoes = max(1, options['repeticoes'] * 20 // tamanho)
+            self.stdout.write(f'\nPágina com {tamanho} linhas ({repeticoes} repetições)')
+
+            inicio = time.perf_counter()
+            for _ in range(repeticoes):
+                serializado = DisciplinaListSerializer(dados['results'], many=True).data
+            serializacao = (time.perf_counter() - inicio) / repeticoes
+            self.stdout.write(f'  serializer: {serializacao * 1e6:10.1f} µs')
+            dados['results'] = serializado
+
+            referencia = renderers['json (DRF)'].render(dados)
+            for nome, renderer in renderers.items():
+                inicio = time.perf_counter()
+                for _ in range(repeticoes):
+                    conteudo = renderer.render(dados)
+                duracao = (time.perf_counter() - inicio) / repeticoes
+                tamanhos = f'{len(conteudo)} B, gzip {len(comprimir(GzipCompressor(6), conteudo))} B'
+                if brotli is not None:
+                    tamanhos += f', br {len(brotli.compress(conteudo, quality=4))} B'
+                identico = ''
+                if renderer.media_type == 'application/json':
+                    identico = ' idêntico' if conteudo == referencia else ' DIVERGENTE'
+                self.stdout.write(
+                    f'  {nome:12} {duracao * 1e6:10.1f} µs  {tamanhos}{identico}'
+                )
+
+    def pagina(self, tamanho):
+        curso = Curso(
+            id=uuid.uuid4(), codigo='ADS2025',
+            nome='Análise e Desenvolvimento de Sistemas', carga_horaria_total=2400,
+        )
+        disciplinas = [
+            Disciplina(
+                id=uuid.uuid4(), codigo=f'DISC{i:05d}', nome=f'Disciplina número {i} – ênfase',
+                carga_horaria=60 + i % 5 * 20, curso=curso, ativo=i % 3 != 0,
+            )
+            for i in range(tamanho)
+        ]
+        return {
+            'count': tamanho * 10,
+            'next': 'http://localhost:8000/disciplinas/?page=2',
+            'previous': None,
+            'results': disciplinas,
+        }
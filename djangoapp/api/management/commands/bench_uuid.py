@@ -0,0 +1,90 @@
+import io
+import json
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.ids import uuid7
+
+ESQUEMA = 'bench_uuid'
+
+GERADORES = {
+    'uuid4': uuid.uuid4,
+    'uuid7': uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = 'Compara inserção, tamanho de índice e hit ratio de chaves UUID v4 x v7.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=2_000_000)
+        parser.add_argument('--lote', type=int, default=100_000)
+        parser.add_argument('--por-curso', type=int, default=20,
+                            help='Disciplinas geradas por curso durante a carga.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Benchmark disponível apenas no PostgreSQL.')
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE')
+            cursor.execute(f'CREATE SCHEMA {ESQUEMA}')
+            try:
+                for nome, gerador in GERADORES.items():
+                    self.carregar(cursor, nome, gerador, options)
+            finally:
+                cursor.execute(f'DROP SCHEMA {ESQUEMA} CASCADE')
+
+    def carregar(self, cursor, nome, gerador, options):
+        tabela = f'{ESQUEMA}.disciplinas_{nome}'
+        cursor.execute(f"""
+            CREATE TABLE {tabela} (
+                id uuid PRIMARY KEY,
+                codigo varchar(50) NOT NULL,
+                curso_id uuid NOT NULL
+            );
+            CREATE INDEX ON {tabela} (curso_id);
+            CREATE TEMP TABLE lote (LIKE {tabela});
+        """)
+
+        total, duracao, acertos, leituras = 0, 0.0, 0, 0
+        curso_id = None
+        while total < options['linhas']:
+            tamanho = min(options['lote'], options['linhas'] - total)
+            buffer = io.StringIO()
+            for i in range(total, total + tamanho):
+                if i % options['por_curso'] == 0:
+                    curso_id = gerador()
+                buffer.write(f'{gerador()}\tDISC{i}\t{curso_id}\n')
+            buffer.seek(0)
+            cursor.execute('TRUNCATE lote')
+            cursor.copy_expert('COPY lote FROM STDIN', buffer)
+
+            cursor.execute(
+                f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) INSERT INTO {tabela} SELECT * FROM lote'
+            )
+            plano = cursor.fetchone()[0]
+            if isinstance(plano, str):
+                plano = json.loads(plano)
+            duracao += plano[0]['Execution Time'] / 1000
+            acertos += plano[0]['Plan'].get('Shared Hit Blocks', 0)
+            leituras += plano[0]['Plan'].get('Shared Read Blocks', 0)
+            total += tamanho
+
+        cursor.execute(f"""
+            SELECT pg_relation_size(i.indexrelid), pg_get_indexdef(i.indexrelid)
+            FROM pg_index i WHERE i.indrelid = '{tabela}'::regclass
+            ORDER BY i.indisprimary DESC
+        """)
+        indices = cursor.fetchall()
+        cursor.execute('DROP TABLE lote')
+
+        hit_ratio = acertos / (acertos + leituras) if acertos + leituras else 1.0
+        self.stdout.write(f'\n{nome}: {total} linhas')
+        self.stdout.write(f'  inserção: {total / duracao:,.0f} linhas/s ({duracao:.2f}s)')
+        self.stdout.write(f'  buffer hit ratio: {hit_ratio:.2%} ({leituras} blocos lidos)')
+        for tamanho, definicao in indices:
+            coluna = definicao[definicao.rindex('(') + 1:-1]
+            self.stdout.write(f'  índice {coluna}: {tamanho / 1024 / 1024:.1f} MiB')
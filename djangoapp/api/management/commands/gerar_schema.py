@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.schema import caminho_schema, gerar_schema, salvar_schema
+
+
+class Command(BaseCommand):
+    help = 'Gera e armazena o schema OpenAPI pré-serializado da versão atual do código.'
+
+    def handle(self, *args, **options):
+        salvar_schema(gerar_schema())
+        for formato in ('yaml', 'json'):
+            self.stdout.write(f'Schema gerado: {caminho_schema(formato)}')
@@ -0,0 +1,63 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+LINHA = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+SCRIPT = (
+    'import time; inicio = time.perf_counter(); '
+    'import django; django.setup(); '
+    'from django.urls import get_resolver; get_resolver().url_patterns; '
+    'print(time.perf_counter() - inicio)'
+)
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de import na inicialização, agrupado por app.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modulos', type=int, default=15,
+                            help='Quantidade de módulos mais lentos a listar.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ['DJANGO_SETTINGS_MODULE'])
+        processo = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR, check=True,
+        )
+
+        apps_instalados = sorted(
+            (config.name for config in apps.get_app_configs()), key=len, reverse=True
+        )
+        por_app = defaultdict(int)
+        modulos = []
+        for linha in processo.stderr.splitlines():
+            encontrado = LINHA.match(linha)
+            if not encontrado:
+                continue
+            proprio, acumulado, indentacao, modulo = encontrado.groups()
+            modulos.append((int(proprio), modulo))
+            if len(indentacao) == 1:
+                por_app[self.dono(modulo, apps_instalados)] += int(acumulado)
+
+        total = float(processo.stdout.strip().splitlines()[-1])
+        self.stdout.write(f'Inicialização (django.setup + URLconf): {total * 1000:.1f} ms\n')
+        self.stdout.write('Tempo de import por app (ms, acumulado):')
+        for dono, micros in sorted(por_app.items(), key=lambda item: -item[1]):
+            self.stdout.write(f'  {micros / 1000:9.1f}  {dono}')
+
+        self.stdout.write(f'\nMódulos mais lentos (ms, próprio):')
+        for micros, modulo in sorted(modulos, reverse=True)[:options['modulos']]:
+            self.stdout.write(f'  {micros / 1000:9.1f}  {modulo}')
+
+    def dono(self, modulo, apps_instalados):
+        for nome in apps_instalados:
+            if modulo == nome or modulo.startswith(nome + '.'):
+                return nome
+        return modulo.split('.')[0]
@@ -0,0 +1,65 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from api import invalidacao
+from cursos.cache import CacheCursos
+from cursos.models import Curso
+
+
+class Command(BaseCommand):
+    help = 'Verifica o barramento de invalidação (LISTEN/NOTIFY) no PostgreSQL local.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--timeout', type=float, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Verificação disponível apenas no PostgreSQL.')
+        curso = Curso.objects.first()
+        if curso is None:
+            raise CommandError('Cadastre ao menos um curso antes da verificação.')
+        self.timeout = options['timeout']
+
+        with override_settings(INVALIDACAO={
+            'ATIVO': True, 'CANAL': 'verificar_invalidacao', 'MAXIMO_IDS': 1000,
+        }):
+            cache = CacheCursos(tamanho=16, ttl=3600)
+            invalidacao.registrar(
+                'cursos', lambda pk: cache.invalidar(Curso._meta.pk.to_python(pk)), cache.limpar
+            )
+            ouvinte = invalidacao.get_ouvinte()
+            self.aguardar('conexão do ouvinte', lambda: ouvinte.conexao is not None)
+
+            # Simula outro worker: as mensagens chegam apenas pelo NOTIFY.
+            cache.obter(curso.pk)
+            self.notificar({'r': 'cursos', 'ids': [str(curso.pk)]})
+            self.aguardar('remoção por id', lambda: curso.pk not in cache.entradas)
+
+            cache.obter(curso.pk)
+            self.notificar({'r': 'cursos'})
+            self.aguardar('limpeza do recurso', lambda: not cache.entradas)
+
+            cache.obter(curso.pk)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT pg_terminate_backend(%s)', [ouvinte.conexao.get_backend_pid()]
+                )
+            self.aguardar('limpeza na reconexão', lambda: not cache.entradas)
+
+    def notificar(self, mensagem):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_notify(%s, %s)', ['verificar_invalidacao', json.dumps(mensagem)]
+            )
+
+    def aguardar(self, nome, condicao):
+        inicio = time.perf_counter()
+        while not condicao():
+            if time.perf_counter() - inicio > self.timeout:
+                raise CommandError(f'{nome}: não aconteceu em {self.timeout:.0f}s.')
+            time.sleep(0.01)
+        self.stdout.write(f'{nome:24} ok ({(time.perf_counter() - inicio) * 1000:.1f} ms)')
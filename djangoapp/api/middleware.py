@@ -0,0 +1,139 @@
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIPOS_COMPRIMIVEIS = re.compile(
+    r'^(text/(?!event-stream)|application/([\w.+-]*\+)?(json|msgpack|xml|javascript|yaml)'
+    r'|application/vnd\.oai\.openapi)'
+)
+
+
+class GzipCompressor:
+    def __init__(self, nivel):
+        self._compressor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+
+    def processar(self, dados):
+        return self._compressor.compress(dados) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, nivel):
+        self._compressor = brotli.Compressor(quality=nivel)
+
+    def processar(self, dados):
+        return self._compressor.process(dados) + self._compressor.flush()
+
+    def finalizar(self):
+        return self._compressor.finish()
+
+
+def comprimir(compressor, dados):
+    return compressor.processar(dados) + compressor.finalizar()
+
+
+def escolher_codificacao(accept_encoding):
+    aceitas = {}
+    for item in accept_encoding.split(','):
+        nome, _, parametros = item.strip().partition(';')
+        qualidade = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith('q='):
+            try:
+                qualidade = float(parametros[2:])
+            except ValueError:
+                qualidade = 0.0
+        aceitas[nome.strip().lower()] = qualidade
+
+    candidatas = ['br', 'gzip'] if brotli is not None else ['gzip']
+    melhor = max(candidatas, key=lambda nome: aceitas.get(nome, aceitas.get('*', 0.0)))
+    return melhor if aceitas.get(melhor, aceitas.get('*', 0.0)) > 0 else None
+
+
+class CompressaoMiddleware:
+    """Comprime respostas com brotli (se instalado) ou gzip.
+
+    Respostas menores que ``TAMANHO_MINIMO`` e tipos não textuais são enviadas
+    como estão. Respostas em streaming são comprimidas pedaço a pedaço, com
+    flush a cada pedaço, e ``text/event-stream`` nunca é comprimido. Roda
+    nativamente em WSGI e ASGI, sem troca de thread por requisição.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        config = settings.COMPRESSAO
+        self.tamanho_minimo = config['TAMANHO_MINIMO']
+        self.niveis = {'gzip': config['NIVEL_GZIP'], 'br': config['NIVEL_BROTLI']}
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def compressor(self, codificacao):
+        if codificacao == 'br':
+            return BrotliCompressor(self.niveis['br'])
+        return GzipCompressor(self.niveis['gzip'])
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if not TIPOS_COMPRIMIVEIS.match(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < self.tamanho_minimo:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codificacao = escolher_codificacao(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if codificacao is None:
+            return response
+
+        compressor = self.compressor(codificacao)
+        if response.streaming:
+            original = response.streaming_content
+            if response.is_async:
+                async def comprimido():
+                    async for pedaco in original:
+                        if pedaco:
+                            yield compressor.processar(pedaco)
+                    yield compressor.finalizar()
+            else:
+                def comprimido():
+                    for pedaco in original:
+                        if pedaco:
+                            yield compressor.processar(pedaco)
+                    yield compressor.finalizar()
+            response.streaming_content = comprimido()
+            del response.headers['Content-Length']
+        else:
+            conteudo = comprimir(compressor, response.content)
+            if len(conteudo) >= len(response.content):
+                return response
+            response.content = conteudo
+            response.headers['Content-Length'] = str(len(conteudo))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = codificacao
+        return response
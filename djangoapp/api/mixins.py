@@ -0,0 +1,290 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import router, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from tarefas.executor import enfileirar
+from tarefas.serializers import TarefaSerializer
+
+from .autocompletar import dobrar, get_indice
+from .campos import projetar
+from .facetas import contar_facetas, geracao
+from .invalidacao import RECURSOS
+
+
+class CamposMixin:
+    """``?fields=``/``?omit=`` nas leituras: corta os campos do serializer e
+    leva a projeção ao SQL com ``projetar`` (``only()``, joins e ``anotacoes``
+    apenas do que foi pedido).
+    """
+
+    acoes_de_leitura = ('list', 'retrieve', 'batch')
+    anotacoes = {}
+
+    def campos_pedidos(self):
+        if not hasattr(self, '_campos_pedidos'):
+            campos = {
+                nome: campo
+                for nome, campo in self.get_serializer_class()().fields.items()
+                if not campo.write_only
+            }
+            if self.action in self.acoes_de_leitura:
+                for parametro in ('fields', 'omit'):
+                    valor = self.request.query_params.get(parametro)
+                    if not valor:
+                        continue
+                    nomes = valor.split(',')
+                    desconhecidos = [nome for nome in nomes if nome not in campos]
+                    if desconhecidos:
+                        raise ValidationError({
+                            parametro: [f'Campos disponíveis: {", ".join(campos)}.'],
+                        })
+                    campos = {
+                        nome: campo for nome, campo in campos.items()
+                        if (nome in nomes) == (parametro == 'fields')
+                    }
+            self._campos_pedidos = campos
+        return self._campos_pedidos
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.acoes_de_leitura:
+            queryset = projetar(queryset, self.campos_pedidos(), self.anotacoes)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.action in self.acoes_de_leitura:
+            pedidos = self.campos_pedidos()
+            alvo = getattr(serializer, 'child', serializer)
+            for nome in list(alvo.fields):
+                if nome not in pedidos and not alvo.fields[nome].write_only:
+                    alvo.fields.pop(nome)
+        return serializer
+
+
+class AtivacaoMixin:
+    """Ações ``ativar``/``inativar`` via ``Model.alterar_ativo``.
+
+    O UPDATE já vem restrito ao ``get_queryset()`` da view; as permissões de
+    objeto são checadas na linha devolvida, na mesma transação, que é
+    desfeita se o acesso for negado.
+    """
+
+    @action(detail=True, methods=['patch'])
+    def inativar(self, request, pk=None):
+        return self._alterar_ativo(pk, False)
+
+    @action(detail=True, methods=['patch'])
+    def ativar(self, request, pk=None):
+        return self._alterar_ativo(pk, True)
+
+    def _alterar_ativo(self, pk, ativo):
+        queryset = self.get_queryset()
+        model = queryset.model
+        with transaction.atomic(using=router.db_for_write(model)):
+            instancia = model.alterar_ativo(pk, ativo, queryset=queryset)
+            self.check_object_permissions(self.request, instancia)
+        serializer = self.get_serializer(instancia)
+        return Response(serializer.data)
+
+
+class TarefasMixin:
+    """Operações pesadas executadas pelo worker; respondem 202 com a tarefa.
+
+    A seleção usa os mesmos ``filterset_fields`` da listagem (query string) e,
+    opcionalmente, uma lista ``ids`` no corpo.
+    """
+
+    campos_exportacao = ()
+
+    @action(detail=False, methods=['post'])
+    def ativar_lote(self, request):
+        return self.enfileirar('alterar_ativo_em_lote', {**self.selecao(request, True), 'ativo': True})
+
+    @action(detail=False, methods=['post'])
+    def inativar_lote(self, request):
+        return self.enfileirar('alterar_ativo_em_lote', {**self.selecao(request, True), 'ativo': False})
+
+    @action(detail=False, methods=['post'])
+    def exportar(self, request):
+        return self.enfileirar('exportar_csv', {
+            **self.selecao(request), 'campos': list(self.campos_exportacao),
+        })
+
+    def selecao(self, request, obrigatoria=False):
+        filtros = {
+            campo: request.query_params[campo]
+            for campo in self.filterset_fields if campo in request.query_params
+        }
+        if filtros:
+            queryset = self.get_queryset()
+            filterset_class = DjangoFilterBackend().get_filterset_class(self, queryset)
+            filterset = filterset_class(filtros, queryset=queryset)
+            if not filterset.is_valid():
+                raise ValidationError(filterset.errors)
+            filtros = {
+                campo: valor for campo, valor in filtros.items()
+                if filterset.form.cleaned_data.get(campo) not in (None, '')
+            }
+
+        ids = request.data.get('ids', []) if isinstance(request.data, dict) else []
+        if not isinstance(ids, list):
+            raise ValidationError({'ids': ['Informe uma lista de ids.']})
+        maximo = settings.TAREFAS['MAXIMO_IDS']
+        if len(ids) > maximo:
+            raise ValidationError({
+                'ids': [f'Informe no máximo {maximo} ids; use filtros para seleções maiores.'],
+            })
+        try:
+            ids = [str(self.queryset.model._meta.pk.to_python(pk)) for pk in ids]
+        except DjangoValidationError:
+            raise ValidationError({'ids': ['Lista contém ids inválidos.']})
+
+        if obrigatoria and not (filtros or ids):
+            raise ValidationError('Informe filtros ou ids para a operação em lote.')
+        viewset = type(self)
+        return {
+            'recurso': f'{viewset.__module__}.{viewset.__qualname__}',
+            'filtros': filtros,
+            'ids': ids,
+        }
+
+    def enfileirar(self, tipo, parametros):
+        tarefa = enfileirar(tipo, parametros, self.request.user)
+        return Response(
+            TarefaSerializer(tarefa).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': reverse('tarefa-detail', args=[tarefa.pk])},
+        )
+
+
+class FacetasMixin:
+    """Ação ``facets``: contagens por dimensão com os mesmos filtros da listagem.
+
+    ``?dimensoes=ativo,curso`` escolhe as dimensões (padrão: ``facetas``) e
+    ``?limite=`` corta os valores de cada uma (no máximo ``FACETAS['LIMITE']``).
+    O resultado fica alguns segundos no cache (``FACETAS['CACHE_TTL']``) e sai
+    dele na primeira invalidação publicada no barramento.
+    """
+
+    facetas = ()
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        dimensoes = request.query_params.get('dimensoes')
+        dimensoes = dimensoes.split(',') if dimensoes else list(self.facetas)
+        invalidas = [dimensao for dimensao in dimensoes if dimensao not in self.facetas]
+        if invalidas or not dimensoes:
+            raise ValidationError({
+                'dimensoes': [f'Dimensões disponíveis: {", ".join(self.facetas)}.'],
+            })
+        try:
+            limite = int(request.query_params.get('limite', settings.FACETAS['LIMITE']))
+        except ValueError:
+            raise ValidationError({'limite': ['Informe um número inteiro.']})
+        limite = max(0, min(limite, settings.FACETAS['LIMITE']))
+
+        ttl = settings.FACETAS['CACHE_TTL']
+        digest = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+        chave = f'facetas:{geracao()}:{digest}'
+        dados = cache.get(chave) if ttl else None
+        if dados is None:
+            total, contagens = contar_facetas(
+                self.filter_queryset(self.get_queryset()), dimensoes
+            )
+            dados = {
+                'total': total,
+                'facets': {
+                    dimensao: [
+                        {'valor': valor, 'total': quantidade}
+                        for valor, quantidade in valores[:limite]
+                    ]
+                    for dimensao, valores in contagens.items()
+                },
+            }
+            if ttl:
+                cache.set(chave, dados, ttl)
+        return Response(dados)
+
+
+class LeituraEmLoteMixin:
+    """Ação ``batch``: vários registros por id em uma única consulta.
+
+    Os ids vêm em ``?ids=a,b`` ou, para listas longas, no corpo de um POST
+    (``{"ids": [...]}``). A resposta mantém a ordem pedida e lista em
+    ``ausentes`` os ids não encontrados.
+    """
+
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        if request.method == 'POST':
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+            if not isinstance(ids, list):
+                raise ValidationError({'ids': ['Informe uma lista de ids.']})
+        else:
+            ids = [pk for valor in request.query_params.getlist('ids') for pk in valor.split(',') if pk]
+        maximo = settings.LEITURA_EM_LOTE['MAXIMO']
+        if len(ids) > maximo:
+            raise ValidationError({'ids': [f'Informe no máximo {maximo} ids.']})
+        if not all(isinstance(pk, str) for pk in ids):
+            raise ValidationError({'ids': ['Lista contém ids inválidos.']})
+        try:
+            ids = list(dict.fromkeys(self.queryset.model._meta.pk.to_python(pk) for pk in ids))
+        except DjangoValidationError:
+            raise ValidationError({'ids': ['Lista contém ids inválidos.']})
+        if not ids:
+            raise ValidationError({'ids': ['Informe ao menos um id.']})
+
+        encontrados = {
+            instancia.pk: instancia
+            for instancia in self.get_queryset().filter(pk__in=ids).order_by()
+        }
+        instancias = [encontrados[pk] for pk in ids if pk in encontrados]
+        for instancia in instancias:
+            self.check_object_permissions(request, instancia)
+        return Response({
+            'resultados': self.get_serializer(instancias, many=True).data,
+            'ausentes': [str(pk) for pk in ids if pk not in encontrados],
+        })
+
+
+class AutocompletarMixin:
+    """Ação ``autocomplete``: ativos cujo código ou nome começa com ``?q=``.
+
+    Usa o índice de prefixos em memória do processo; se o catálogo passar de
+    ``AUTOCOMPLETAR['MAXIMO_REGISTROS']`` cai para ``istartswith`` no banco.
+    """
+
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        termo = request.query_params.get('q', '').strip()
+        prefixo = dobrar(termo).strip()
+        if not prefixo:
+            raise ValidationError({'q': ['Informe o termo buscado.']})
+        try:
+            limite = int(request.query_params.get('limite', settings.AUTOCOMPLETAR['LIMITE']))
+        except ValueError:
+            raise ValidationError({'limite': ['Informe um número inteiro.']})
+        limite = max(1, min(limite, settings.AUTOCOMPLETAR['LIMITE_MAXIMO']))
+
+        model = self.queryset.model
+        resultados = get_indice(model, RECURSOS[model._meta.label]).buscar(prefixo, limite)
+        if resultados is None:
+            resultados = model._default_manager.filter(
+                Q(codigo__istartswith=termo) | Q(nome__istartswith=termo), ativo=True
+            ).order_by('codigo').values_list('pk', 'codigo', 'nome')[:limite]
+        return Response({
+            'resultados': [
+                {'id': pk, 'codigo': codigo, 'nome': nome} for pk, codigo, nome in resultados
+            ],
+        })
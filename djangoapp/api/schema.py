@@ -0,0 +1,130 @@
+import hashlib
+import os
+import threading
+from importlib import import_module
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_safe
+
+FORMATOS = {
+    'yaml': 'application/vnd.oai.openapi; charset=utf-8',
+    'json': 'application/vnd.oai.openapi+json; charset=utf-8',
+}
+
+_cache = {}
+_lock = threading.Lock()
+_versao = None
+
+
+def versao_codigo():
+    """Identifica a versão do código que gerou o schema.
+
+    Usa ``APP_VERSION`` quando definido pelo build; caso contrário deriva um
+    hash do caminho, tamanho e mtime dos módulos Python do projeto.
+    """
+    global _versao
+    if _versao is None:
+        versao = os.getenv('APP_VERSION')
+        if not versao:
+            digest = hashlib.sha1()
+            for raiz, dirs, arquivos in os.walk(settings.BASE_DIR):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                for nome in sorted(arquivos):
+                    if nome.endswith('.py'):
+                        stat = os.stat(os.path.join(raiz, nome))
+                        digest.update(f'{raiz}/{nome}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+            versao = digest.hexdigest()[:16]
+        _versao = versao
+    return _versao
+
+
+def caminho_schema(formato):
+    return settings.SCHEMA_CACHE_DIR / f'openapi-{versao_codigo()}.{formato}'
+
+
+def gerar_schema():
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        'yaml': OpenApiYamlRenderer().render(schema, renderer_context={}),
+        'json': OpenApiJsonRenderer().render(schema, renderer_context={}),
+    }
+
+
+def salvar_schema(conteudos):
+    settings.SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for formato, conteudo in conteudos.items():
+        destino = caminho_schema(formato)
+        temporario = destino.with_suffix(f'.{os.getpid()}.tmp')
+        temporario.write_bytes(conteudo)
+        os.replace(temporario, destino)
+    # Os arquivos de versões anteriores do código não serão mais lidos.
+    atual = f'openapi-{versao_codigo()}.'
+    for antigo in settings.SCHEMA_CACHE_DIR.glob('openapi-*'):
+        if not antigo.name.startswith(atual):
+            antigo.unlink(missing_ok=True)
+
+
+def _carregar():
+    try:
+        return {formato: caminho_schema(formato).read_bytes() for formato in FORMATOS}
+    except OSError:
+        pass
+
+    conteudos = gerar_schema()
+    try:
+        salvar_schema(conteudos)
+    except OSError:
+        pass
+    return conteudos
+
+
+def obter_schema(formato):
+    """Retorna ``(conteudo, etag)`` do schema já serializado."""
+    if not _cache:
+        with _lock:
+            if not _cache:
+                for nome, conteudo in _carregar().items():
+                    etag = hashlib.sha1(conteudo).hexdigest()
+                    _cache[nome] = (conteudo, f'"{etag}"')
+    return _cache[formato]
+
+
+def formato_da_requisicao(request):
+    formato = request.GET.get('format')
+    if formato in FORMATOS:
+        return formato
+    return 'json' if 'json' in request.headers.get('Accept', '') else 'yaml'
+
+
+@require_safe
+def schema_view(request):
+    formato = formato_da_requisicao(request)
+    conteudo, etag = obter_schema(formato)
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(conteudo, content_type=FORMATOS[formato])
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    response['Vary'] = 'Accept'
+    return response
+
+
+def lazy_view(caminho, **initkwargs):
+    """Adia o import de uma view fora do caminho das requisições da API."""
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            modulo, nome = caminho.rsplit('.', 1)
+            view = getattr(import_module(modulo), nome).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    wrapper.csrf_exempt = True
+    return wrapper
@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -21,18 +22,23 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'rest_framework.authtoken',
     'rest_framework_simplejwt',
     'drf_spectacular',
     'django_filters',
     'corsheaders',
+    'api',
     'perfis',
     'cursos',
     'disciplinas',
+    'eventos',
+    'perfilador',
+    'tarefas',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'perfilador.middleware.PerfiladorMiddleware',
+    'api.middleware.CompressaoMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -112,6 +118,15 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ] + (['api.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -120,6 +135,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'EXCEPTION_HANDLER': 'api.excecoes.tratar_excecao',
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.limites.GCRAThrottle',
+    ] if int(os.getenv('LIMITES_ATIVOS', 1)) else [],
 }
 
 from datetime import timedelta
@@ -136,6 +155,88 @@ SPECTACULAR_SETTINGS = {
     'SERVE_INCLUDE_SCHEMA': False,
 }
 
+EVENTOS = {
+    'HEARTBEAT': int(os.getenv('EVENTOS_HEARTBEAT', 15)),
+    'BUFFER': int(os.getenv('EVENTOS_BUFFER', 1000)),
+    'PONTE_POSTGRES': bool(int(os.getenv('EVENTOS_PONTE_POSTGRES', 0))),
+    'CANAL': 'catalogo_eventos',
+}
+
+INVALIDACAO = {
+    'ATIVO': bool(int(os.getenv('INVALIDACAO_ATIVO', 0))),
+    'CANAL': 'catalogo_invalidacao',
+    'MAXIMO_IDS': int(os.getenv('INVALIDACAO_MAXIMO_IDS', 1000)),
+}
+
+COMPRESSAO = {
+    'TAMANHO_MINIMO': int(os.getenv('COMPRESSAO_TAMANHO_MINIMO', 1024)),
+    'NIVEL_GZIP': int(os.getenv('COMPRESSAO_NIVEL_GZIP', 6)),
+    'NIVEL_BROTLI': int(os.getenv('COMPRESSAO_NIVEL_BROTLI', 4)),
+}
+
+PERFILADOR = {
+    'SEGREDO': os.getenv('PERFILADOR_SEGREDO', ''),
+    'INTERVALO_MS': float(os.getenv('PERFILADOR_INTERVALO_MS', 5)),
+    'CAPTURAS': int(os.getenv('PERFILADOR_CAPTURAS', 50)),
+}
+
+# Taxas por escopo (``<basename>.<ação>`` ou nome da rota) e por tipo de
+# perfil; ``None`` desliga o limite. O estado fica em memória do processo ou,
+# com LIMITES_ESTADO=cache, no cache compartilhado.
+LIMITES = {
+    'ESTADO': os.getenv('LIMITES_ESTADO', 'memoria'),
+    'CACHE': 'default',
+    'TAXAS': {
+        'padrao': {'Gerente': '600/min', 'Professor': '300/min', 'anonimo': '60/min'},
+        'token_obtain_pair': {'anonimo': '10/min'},
+        'token_refresh': {'anonimo': '30/min'},
+        'curso.list': {'Gerente': '120/min', 'Professor': '60/min'},
+        'disciplina.list': {'Gerente': '120/min', 'Professor': '60/min'},
+        'perfil.list': {'Gerente': '120/min', 'Professor': '60/min'},
+        'curso.importar': {'Gerente': '10/h'},
+        'curso.exportar': {'Gerente': '30/h'},
+        'disciplina.exportar': {'Gerente': '30/h'},
+        'perfil.exportar': {'Gerente': '30/h'},
+    },
+}
+
+FACETAS = {
+    'CACHE_TTL': int(os.getenv('FACETAS_CACHE_TTL', 15)),
+    'LIMITE': 100,
+}
+
+AUTOCOMPLETAR = {
+    'MAXIMO_REGISTROS': int(os.getenv('AUTOCOMPLETAR_MAXIMO_REGISTROS', 100_000)),
+    'TTL': float(os.getenv('AUTOCOMPLETAR_TTL', 60)),
+    'LIMITE': 10,
+    'LIMITE_MAXIMO': 50,
+}
+
+CACHE_CURSOS = {
+    'TAMANHO': int(os.getenv('CACHE_CURSOS_TAMANHO', 1024)),
+    'TTL': float(os.getenv('CACHE_CURSOS_TTL', 60)),
+}
+
+INCLUSOES = {
+    'LIMITE': int(os.getenv('INCLUSOES_LIMITE', 100)),
+}
+
+LEITURA_EM_LOTE = {
+    'MAXIMO': int(os.getenv('LEITURA_EM_LOTE_MAXIMO', 200)),
+}
+
+TAREFAS = {
+    'DIRETORIO': DATA_DIR / 'tarefas',
+    'CONCORRENCIA': int(os.getenv('TAREFAS_CONCORRENCIA', 2)),
+    'INTERVALO': float(os.getenv('TAREFAS_INTERVALO', 1)),
+    'TIMEOUT': int(os.getenv('TAREFAS_TIMEOUT', 300)),
+    'MAX_TENTATIVAS': int(os.getenv('TAREFAS_MAX_TENTATIVAS', 3)),
+    'ESPERA_RETENTATIVA': int(os.getenv('TAREFAS_ESPERA_RETENTATIVA', 30)),
+    'MAXIMO_IDS': int(os.getenv('TAREFAS_MAXIMO_IDS', 10_000)),
+}
+
+SCHEMA_CACHE_DIR = DATA_DIR / 'schema'
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8000",
     "http://127.0.0.1:8000",
@@ -0,0 +1,174 @@
+from django.core.exceptions import ValidationError
+from django.db import connections, router
+from django.db.models.signals import post_save
+from django.http import Http404
+
+from .invalidacao import agrupar
+
+
+def _colunas(model, alias):
+    campos = model._meta.concrete_fields
+    return [f.attname for f in campos], [f'{alias}.{f.column}' for f in campos]
+
+
+def _instancia(model, conexao, valores):
+    campos = model._meta.concrete_fields
+    convertidos = []
+    for campo, valor in zip(campos, valores):
+        coluna = campo.get_col(model._meta.db_table)
+        for conversor in conexao.ops.get_db_converters(coluna) + campo.get_db_converters(conexao):
+            valor = conversor(valor, coluna, conexao)
+        convertidos.append(valor)
+    return model.from_db(conexao.alias, [f.attname for f in campos], convertidos)
+
+
+def _atualizar(model, conexao, pk, ativo, guarda, extras, relacionados, escopo):
+    atributos, colunas = _colunas(model, 't')
+    origem, condicoes = [], []
+    for nome in relacionados:
+        campo = model._meta.get_field(nome)
+        alias = f'r_{nome}'
+        origem.append(f'{campo.related_model._meta.db_table} {alias}')
+        condicoes.append(f'{alias}.{campo.target_field.column} = t.{campo.column}')
+        colunas += _colunas(campo.related_model, alias)[1]
+    colunas += list(extras.values())
+
+    condicoes += [
+        f't.{model._meta.pk.column} = %s',
+        't.ativo IS DISTINCT FROM %s',
+    ]
+    params = []
+    if escopo is not None:
+        subconsulta, params = (
+            escopo.query.get_compiler(conexao.alias).as_sql()
+        )
+        condicoes.append(f't.{model._meta.pk.column} IN ({subconsulta})')
+    if ativo and guarda:
+        condicoes.append(f'({guarda})')
+
+    sql = (
+        f'UPDATE {model._meta.db_table} AS t SET ativo = %s '
+        + (f'FROM {", ".join(origem)} ' if origem else '')
+        + f'WHERE {" AND ".join(condicoes)} '
+        + f'RETURNING {", ".join(colunas)}'
+    )
+    with conexao.cursor() as cursor:
+        cursor.execute(sql, [
+            ativo, model._meta.pk.get_db_prep_value(pk, conexao), ativo, *params,
+        ])
+        linha = cursor.fetchone()
+
+    if linha is None:
+        return None
+
+    instancia = _instancia(model, conexao, linha)
+    posicao = len(atributos)
+    for nome in relacionados:
+        relacionado = model._meta.get_field(nome).related_model
+        tamanho = len(relacionado._meta.concrete_fields)
+        setattr(instancia, nome, _instancia(
+            relacionado, conexao, linha[posicao:posicao + tamanho]
+        ))
+        posicao += tamanho
+    for nome, valor in zip(extras, linha[posicao:]):
+        setattr(instancia, nome, valor)
+
+    return instancia
+
+
+def alterar_ativo(model, pk, ativo, guarda='', extras=None, relacionados=(), queryset=None):
+    """Muda ``ativo`` com um único ``UPDATE ... RETURNING``.
+
+    ``guarda`` é um trecho SQL (alias ``t`` para a linha alterada) aplicado
+    apenas na ativação; ``extras`` mapeia atributos a expressões SQL também
+    devolvidas pelo RETURNING e ``relacionados`` lista ForeignKeys cujas
+    linhas são lidas no mesmo comando. A instância devolvida é montada a
+    partir do RETURNING e ``post_save`` é enviado com
+    ``update_fields={'ativo'}``. ``queryset`` restringe as linhas alcançáveis
+    (o escopo da view) no próprio UPDATE.
+
+    Quando nada é atualizado a linha é lida de novo: sem mudança de estado
+    ela é devolvida como está; se a guarda falhou, ``validar_restricoes()`` da
+    instância produz a mesma mensagem de erro da validação do modelo. Fora
+    do PostgreSQL a transição é feita pelo ORM, validando antes de ativar.
+    """
+    try:
+        pk = model._meta.pk.to_python(pk)
+    except ValidationError:
+        raise Http404
+    using = router.db_for_write(model)
+    conexao = connections[using]
+    postgres = conexao.vendor == 'postgresql'
+    escopo = None
+    if queryset is not None and queryset.query.where:
+        escopo = queryset.using(using).order_by().values('pk')
+    instancia = None
+    if postgres:
+        instancia = _atualizar(
+            model, conexao, pk, ativo, guarda, extras or {}, relacionados, escopo
+        )
+
+    if instancia is None:
+        manager = model._default_manager.using(using)
+        linhas = manager.filter(pk=pk)
+        if escopo is not None:
+            linhas = linhas.filter(pk__in=escopo)
+        instancia = linhas.first()
+        if instancia is None:
+            raise Http404
+        if instancia.ativo == ativo:
+            return instancia
+        instancia.ativo = ativo
+        if ativo:
+            instancia.validar_restricoes()
+        if postgres:
+            raise ValidationError('Não foi possível alterar o estado do registro.')
+        manager.filter(pk=pk).update(ativo=ativo)
+
+    post_save.send(
+        sender=model, instance=instancia, created=False,
+        update_fields=frozenset({'ativo'}), raw=False, using=using,
+    )
+    return instancia
+
+
+def alterar_ativo_em_lote(queryset, ativo):
+    """Muda ``ativo`` de todas as linhas do queryset com um único UPDATE.
+
+    As instâncias alteradas são montadas a partir do RETURNING e recebem
+    ``post_save`` como em ``alterar_ativo``. No PostgreSQL a ativação conta
+    com as restrições do banco; nos demais bancos cada linha é validada antes.
+    """
+    model = queryset.model
+    conexao = connections[queryset.db]
+    if conexao.vendor == 'postgresql':
+        subconsulta, params = (
+            queryset.order_by().values('pk').query.get_compiler(queryset.db).as_sql()
+        )
+        colunas = _colunas(model, 't')[1]
+        sql = (
+            f'UPDATE {model._meta.db_table} AS t SET ativo = %s '
+            f'WHERE t.{model._meta.pk.column} IN ({subconsulta}) '
+            f'AND t.ativo IS DISTINCT FROM %s '
+            f'RETURNING {", ".join(colunas)}'
+        )
+        with conexao.cursor() as cursor:
+            cursor.execute(sql, [ativo, *params, ativo])
+            instancias = [_instancia(model, conexao, linha) for linha in cursor.fetchall()]
+    else:
+        instancias = list(queryset.exclude(ativo=ativo))
+        for instancia in instancias:
+            instancia.ativo = ativo
+            if ativo:
+                instancia.validar_restricoes()
+        model._base_manager.using(queryset.db).filter(
+            pk__in=[instancia.pk for instancia in instancias]
+        ).update(ativo=ativo)
+
+    with agrupar():
+        for instancia in instancias:
+            post_save.send(
+                sender=model, instance=instancia, created=False,
+                update_fields=frozenset({'ativo'}), raw=False, using=queryset.db,
+            )
+    return instancias
@@ -1,20 +1,28 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import path, include
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from .schema import lazy_view, schema_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('schema/', schema_view, name='schema'),
+    path(
+        'swagger/',
+        lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'),
+        name='swagger-ui'
+    ),
     path('perfis/', include('perfis.urls')),
     path('cursos/', include('cursos.urls')),
     path('disciplinas/', include('disciplinas.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    path('eventos/', include('eventos.urls')),
+    path('perfilador/', include('perfilador.urls')),
+    path('tarefas/', include('tarefas.urls')),
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT) + staticfiles_urlpatterns()
\ No newline at end of file
@@ -1,14 +1,27 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
+from api.admin import CatalogoAdminMixin
 from .models import Curso
 
 
 @admin.register(Curso)
-class CursoAdmin(admin.ModelAdmin):
-    list_display = ('codigo', 'nome', 'carga_horaria_total', 'ativo', 'total_disciplinas_ativas')
+class CursoAdmin(CatalogoAdminMixin, admin.ModelAdmin):
+    list_display = (
+        'codigo', 'nome', 'carga_horaria_total', 'ativo', 'total_disciplinas_ativas', 'disciplinas'
+    )
     list_filter = ('ativo',)
     search_fields = ('codigo', 'nome', 'descricao')
     ordering = ('codigo',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).com_agregados()
+
     def total_disciplinas_ativas(self, obj):
         return obj.total_disciplinas_ativas
-    total_disciplinas_ativas.short_description = 'Disciplinas Ativas'
\ No newline at end of file
+    total_disciplinas_ativas.short_description = 'Disciplinas Ativas'
+
+    def disciplinas(self, obj):
+        url = reverse('admin:disciplinas_disciplina_changelist')
+        return format_html('<a href="{}?curso__id__exact={}">Ver disciplinas</a>', url, obj.pk)
+    disciplinas.short_description = 'Disciplinas'
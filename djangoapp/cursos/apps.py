@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class CursosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'cursos'
\ No newline at end of file
+    name = 'cursos'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,110 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router, transaction
+
+from api.invalidacao import registrar
+
+from .models import Curso
+
+
+class CacheCursos:
+    """Cache LRU com TTL de linhas de ``Curso`` por pk, dentro do processo.
+
+    Cada escrita invalida a entrada na hora e de novo no commit. Uma leitura
+    só guarda o que buscou no banco se nenhuma invalidação aconteceu durante
+    a busca (contador ``versao``), então um valor antigo não volta ao cache
+    depois de uma escrita. Leituras dentro de um bloco ``atomic`` não são
+    guardadas: podem enxergar escritas ainda não confirmadas, e num rollback
+    nenhum ``on_commit`` viria removê-las. Quem recebe o curso ganha uma cópia.
+    """
+
+    def __init__(self, tamanho, ttl):
+        self.tamanho = tamanho
+        self.ttl = ttl
+        self.versao = 0
+        self.entradas = OrderedDict()
+        self.lock = threading.Lock()
+        self.acertos = self.falhas = self.expirados = self.invalidacoes = 0
+
+    def obter(self, pk):
+        """Devolve o curso (cópia) ou levanta ``Curso.DoesNotExist``."""
+        agora = time.monotonic()
+        with self.lock:
+            entrada = self.entradas.get(pk)
+            if entrada is not None:
+                if entrada[0] > agora:
+                    self.entradas.move_to_end(pk)
+                    self.acertos += 1
+                    return copy.copy(entrada[1])
+                del self.entradas[pk]
+                self.expirados += 1
+            self.falhas += 1
+            versao = self.versao
+
+        using = router.db_for_read(Curso)
+        curso = Curso.objects.using(using).get(pk=pk)
+        if self.ttl and not transaction.get_connection(using).in_atomic_block:
+            with self.lock:
+                if versao == self.versao:
+                    self.entradas[curso.pk] = (time.monotonic() + self.ttl, curso)
+                    self.entradas.move_to_end(curso.pk)
+                    while len(self.entradas) > self.tamanho:
+                        self.entradas.popitem(last=False)
+        return copy.copy(curso)
+
+    def invalidar(self, pk):
+        with self.lock:
+            self.versao += 1
+            self.invalidacoes += 1
+            self.entradas.pop(pk, None)
+
+    def limpar(self):
+        with self.lock:
+            self.versao += 1
+            self.entradas.clear()
+
+    def estatisticas(self):
+        with self.lock:
+            leituras = self.acertos + self.falhas
+            return {
+                'tamanho': len(self.entradas),
+                'capacidade': self.tamanho,
+                'ttl': self.ttl,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'expirados': self.expirados,
+                'invalidacoes': self.invalidacoes,
+                'taxa_acerto': self.acertos / leituras if leituras else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache_cursos():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cache = CacheCursos(
+                    settings.CACHE_CURSOS['TAMANHO'], settings.CACHE_CURSOS['TTL']
+                )
+                registrar(
+                    'cursos',
+                    lambda pk: cache.invalidar(Curso._meta.pk.to_python(pk)),
+                    cache.limpar,
+                )
+                _cache = cache
+    return _cache
+
+
+def invalidar_curso(pk, using='default'):
+    """Invalida agora e de novo no commit, quando a escrita fica visível."""
+    cache = get_cache_cursos()
+    cache.invalidar(pk)
+    transaction.on_commit(lambda: cache.invalidar(pk), using=using)
@@ -0,0 +1,363 @@
+import csv
+import io
+import json
+import time
+import uuid
+
+from django.db import DatabaseError, connection, transaction
+
+from api.invalidacao import publicar_tudo
+
+COLUNAS = {
+    'cursos': ['codigo', 'nome', 'descricao', 'carga_horaria_total', 'ativo'],
+    'disciplinas': ['codigo', 'nome', 'carga_horaria', 'curso_codigo', 'ativo'],
+}
+
+OBRIGATORIAS = {
+    'cursos': {'codigo', 'nome', 'carga_horaria_total'},
+    'disciplinas': {'codigo', 'nome', 'carga_horaria', 'curso_codigo'},
+}
+
+# Gera UUIDv7 no banco: timestamp em ms nos 48 bits iniciais de um v4 e
+# troca dos bits de versão de 4 para 7 (mesmo layout de api.ids.uuid7).
+UUID7_SQL = """
+encode(
+    set_bit(set_bit(
+        overlay(uuid_send(gen_random_uuid()) PLACING
+            substring(int8send((extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+            FROM 1 FOR 6),
+    52, 1), 53, 1),
+'hex')::uuid
+"""
+
+ATIVO_SQL = "coalesce(lower(trim(s.ativo)), '') NOT IN ('false', 'f', '0', 'não', 'nao', 'n')"
+
+VALIDACAO_COMUM = """
+    WHEN s.erro IS NOT NULL THEN s.erro
+    WHEN coalesce(trim(s.codigo), '') = '' THEN 'O campo codigo é obrigatório.'
+    WHEN length(trim(s.codigo)) > 50 THEN 'O campo codigo excede 50 caracteres.'
+    WHEN coalesce(trim(s.nome), '') = '' THEN 'O campo nome é obrigatório.'
+    WHEN length(trim(s.nome)) > 255 THEN 'O campo nome excede 255 caracteres.'
+    WHEN coalesce(lower(trim(s.ativo)), '') NOT IN
+        ('', 'true', 'false', 't', 'f', '1', '0', 'sim', 's', 'não', 'nao', 'n')
+        THEN 'O campo ativo deve ser verdadeiro ou falso.'
+"""
+
+
+class ArquivoInvalido(Exception):
+    pass
+
+
+class NDJSONParaCSV(io.RawIOBase):
+    """Converte NDJSON em CSV sob demanda para alimentar o COPY."""
+
+    def __init__(self, arquivo, colunas):
+        self._linhas = self._converter(arquivo, colunas)
+        self._resto = b''
+
+    def _converter(self, arquivo, colunas):
+        saida = io.StringIO()
+        escritor = csv.writer(saida, lineterminator='\n')
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                registro = json.loads(linha)
+                if not isinstance(registro, dict):
+                    raise ValueError
+                valores = [registro.get(coluna) for coluna in colunas]
+                erro = None
+            except ValueError:
+                valores, erro = [None] * len(colunas), 'Linha não é um objeto JSON válido.'
+            escritor.writerow([numero, erro] + [
+                '' if valor is None else str(valor).lower() if isinstance(valor, bool) else valor
+                for valor in valores
+            ])
+            yield saida.getvalue().encode()
+            saida.seek(0)
+            saida.truncate()
+
+    def readable(self):
+        return True
+
+    def read(self, tamanho=-1):
+        while tamanho < 0 or len(self._resto) < tamanho:
+            try:
+                self._resto += next(self._linhas)
+            except StopIteration:
+                break
+        if tamanho < 0:
+            dados, self._resto = self._resto, b''
+        else:
+            dados, self._resto = self._resto[:tamanho], self._resto[tamanho:]
+        return dados
+
+
+class ImportacaoCatalogo:
+    """Importa cursos e disciplinas via COPY para tabelas de staging UNLOGGED.
+
+    Os arquivos são lidos em streaming (memória constante) e a validação e
+    a mesclagem em ``cursos``/``disciplinas`` são feitas em SQL por conjunto.
+    Registros são casados pelo ``codigo``: existentes são atualizados e os
+    demais inseridos. Linhas rejeitadas vão para o arquivo de rejeitos.
+    """
+
+    def __init__(self, rejeitos=None, dry_run=False):
+        sufixo = uuid.uuid4().hex[:12]
+        self.tabelas = {
+            'cursos': f'importacao_cursos_{sufixo}',
+            'disciplinas': f'importacao_disciplinas_{sufixo}',
+            'rejeitos': f'importacao_rejeitos_{sufixo}',
+            'orcamento': f'importacao_orcamento_{sufixo}',
+        }
+        self.rejeitos = rejeitos
+        self.dry_run = dry_run
+        self.estatisticas = {
+            'lidas': 0, 'rejeitadas': 0,
+            'cursos_inseridos': 0, 'cursos_atualizados': 0,
+            'disciplinas_inseridas': 0, 'disciplinas_atualizadas': 0,
+        }
+
+    def executar(self, cursos=None, disciplinas=None):
+        inicio = time.perf_counter()
+        with connection.cursor() as cursor:
+            self._criar_staging(cursor)
+            try:
+                for tipo, arquivo in (('cursos', cursos), ('disciplinas', disciplinas)):
+                    if arquivo is not None:
+                        self.estatisticas['lidas'] += self._carregar(cursor, tipo, arquivo)
+
+                with transaction.atomic():
+                    cursor.execute(
+                        'LOCK TABLE cursos, disciplinas IN SHARE ROW EXCLUSIVE MODE'
+                    )
+                    self._mesclar_cursos(cursor)
+                    self._mesclar_disciplinas(cursor)
+                    self._exportar_rejeitos(cursor)
+                    if self.dry_run:
+                        transaction.set_rollback(True)
+                    else:
+                        publicar_tudo('cursos')
+                        publicar_tudo('disciplinas')
+            finally:
+                cursor.execute('DROP TABLE IF EXISTS {} '.format(
+                    ', '.join(self.tabelas.values())
+                ))
+
+        duracao = time.perf_counter() - inicio
+        self.estatisticas['segundos'] = duracao
+        self.estatisticas['linhas_por_segundo'] = self.estatisticas['lidas'] / duracao if duracao else 0
+        return self.estatisticas
+
+    def _criar_staging(self, cursor):
+        for tipo, colunas in COLUNAS.items():
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE {self.tabelas[tipo]} ('
+                'linha bigint GENERATED BY DEFAULT AS IDENTITY (START WITH 2), erro text, '
+                + ', '.join(f'{coluna} text' for coluna in colunas) + ')'
+            )
+        cursor.execute(
+            f'CREATE UNLOGGED TABLE {self.tabelas["rejeitos"]} '
+            '(arquivo text, linha bigint, codigo text, motivo text)'
+        )
+
+    def _carregar(self, cursor, tipo, arquivo):
+        tabela = self.tabelas[tipo]
+        nome = getattr(arquivo, 'name', '')
+        if str(nome).endswith(('.ndjson', '.jsonl')):
+            colunas = ['linha', 'erro'] + COLUNAS[tipo]
+            origem = NDJSONParaCSV(io.TextIOWrapper(arquivo, encoding='utf-8'), COLUNAS[tipo])
+        else:
+            colunas = self._cabecalho_csv(tipo, arquivo)
+            origem = arquivo
+
+        try:
+            cursor.copy_expert(
+                f'COPY {tabela} ({", ".join(colunas)}) FROM STDIN '
+                "WITH (FORMAT csv, ENCODING 'UTF8')",
+                origem,
+            )
+        except DatabaseError as exc:
+            raise ArquivoInvalido(f'Arquivo de {tipo} malformado: {exc}') from exc
+        cursor.execute(f'SELECT count(*) FROM {tabela}')
+        return cursor.fetchone()[0]
+
+    def _cabecalho_csv(self, tipo, arquivo):
+        primeira = arquivo.readline().decode('utf-8-sig')
+        colunas = [coluna.strip().lower() for coluna in next(csv.reader([primeira]), [])]
+        colunas = ['curso_codigo' if coluna == 'curso' else coluna for coluna in colunas]
+        desconhecidas = set(colunas) - set(COLUNAS[tipo])
+        faltando = OBRIGATORIAS[tipo] - set(colunas)
+        if desconhecidas or faltando:
+            raise ArquivoInvalido(
+                f'Cabeçalho inválido no arquivo de {tipo}: '
+                f'colunas desconhecidas {sorted(desconhecidas)}, '
+                f'faltando {sorted(faltando)}'
+            )
+        return colunas
+
+    def _validos(self, tipo, join=''):
+        return (
+            f'FROM {self.tabelas[tipo]} s {join} WHERE NOT EXISTS ('
+            f'SELECT 1 FROM {self.tabelas["rejeitos"]} r '
+            f"WHERE r.arquivo = '{tipo}' AND r.linha = s.linha)"
+        )
+
+    def _mesclar_cursos(self, cursor):
+        rejeitos = self.tabelas['rejeitos']
+        cursor.execute(f"""
+            INSERT INTO {rejeitos} (arquivo, linha, codigo, motivo)
+            SELECT 'cursos', linha, codigo, motivo FROM (
+                SELECT s.linha, s.codigo, CASE
+                    {VALIDACAO_COMUM}
+                    WHEN coalesce(trim(s.carga_horaria_total), '') !~ '^-?[0-9]{{1,9}}$'
+                        THEN 'O campo carga_horaria_total deve ser um número inteiro.'
+                    WHEN row_number() OVER (PARTITION BY trim(s.codigo) ORDER BY s.linha) > 1
+                        THEN 'Código duplicado no arquivo.'
+                    WHEN trim(s.carga_horaria_total)::integer < a.soma
+                        THEN format(
+                            'A soma das cargas horárias das disciplinas (%s) '
+                            'não pode ultrapassar a carga horária total do curso (%s)',
+                            a.soma, trim(s.carga_horaria_total)
+                        )
+                END AS motivo
+                FROM {self.tabelas['cursos']} s
+                -- Reduzir a carga de um curso existente não pode deixar as
+                -- disciplinas ativas atuais acima dela (o trigger abortaria
+                -- a importação inteira).
+                LEFT JOIN LATERAL (
+                    SELECT sum(d.carga_horaria) AS soma
+                    FROM cursos c JOIN disciplinas d ON d.curso_id = c.id
+                    WHERE c.codigo = trim(s.codigo) AND d.ativo
+                ) a ON true
+            ) v
+            WHERE motivo IS NOT NULL
+        """)
+
+        validos = f"""
+            SELECT trim(s.codigo) AS codigo, trim(s.nome) AS nome,
+                   nullif(s.descricao, '') AS descricao,
+                   trim(s.carga_horaria_total)::integer AS carga_horaria_total,
+                   {ATIVO_SQL} AS ativo
+            {self._validos('cursos')}
+        """
+        cursor.execute(f"""
+            UPDATE cursos c
+            SET nome = v.nome, descricao = v.descricao,
+                carga_horaria_total = v.carga_horaria_total, ativo = v.ativo
+            FROM ({validos}) v
+            WHERE c.codigo = v.codigo
+        """)
+        self.estatisticas['cursos_atualizados'] = cursor.rowcount
+        cursor.execute(f"""
+            INSERT INTO cursos (id, codigo, nome, descricao, carga_horaria_total, ativo)
+            SELECT {UUID7_SQL}, v.codigo, v.nome, v.descricao, v.carga_horaria_total, v.ativo
+            FROM ({validos}) v
+            WHERE NOT EXISTS (SELECT 1 FROM cursos c WHERE c.codigo = v.codigo)
+        """)
+        self.estatisticas['cursos_inseridos'] = cursor.rowcount
+
+    def _mesclar_disciplinas(self, cursor):
+        rejeitos = self.tabelas['rejeitos']
+        cursor.execute(f"""
+            INSERT INTO {rejeitos} (arquivo, linha, codigo, motivo)
+            SELECT 'disciplinas', linha, codigo, motivo FROM (
+                SELECT s.linha, s.codigo, CASE
+                    {VALIDACAO_COMUM}
+                    WHEN coalesce(trim(s.carga_horaria), '') !~ '^-?[0-9]{{1,9}}$'
+                        THEN 'O campo carga_horaria deve ser um número inteiro.'
+                    WHEN c.id IS NULL
+                        THEN format('Curso %s não encontrado.', trim(s.curso_codigo))
+                    WHEN NOT c.ativo
+                        THEN 'Não é possível adicionar disciplina a um curso inativado'
+                    WHEN row_number() OVER (PARTITION BY trim(s.codigo) ORDER BY s.linha) > 1
+                        THEN 'Código duplicado no arquivo.'
+                END AS motivo
+                FROM {self.tabelas['disciplinas']} s
+                LEFT JOIN cursos c ON c.codigo = trim(s.curso_codigo)
+            ) v
+            WHERE motivo IS NOT NULL
+        """)
+
+        validos = f"""
+            SELECT s.linha, trim(s.codigo) AS codigo, trim(s.nome) AS nome,
+                   trim(s.carga_horaria)::integer AS carga_horaria,
+                   c.id AS curso_id, {ATIVO_SQL} AS ativo
+            {self._validos('disciplinas', 'JOIN cursos c ON c.codigo = trim(s.curso_codigo)')}
+        """
+
+        # Orçamento de carga horária: as linhas ativas de cada curso são
+        # aceitas na ordem do arquivo enquanto couberem em carga_horaria_total;
+        # só as aceitas entram na soma. A recursão avança uma linha por curso
+        # a cada passo, usando o índice (curso_id, n) da tabela de orçamento.
+        orcamento = self.tabelas['orcamento']
+        cursor.execute(f"""
+            CREATE UNLOGGED TABLE {orcamento} AS
+            WITH validos AS ({validos}),
+            base AS (
+                SELECT d.curso_id, sum(d.carga_horaria) AS soma
+                FROM disciplinas d
+                WHERE d.ativo AND NOT EXISTS (SELECT 1 FROM validos v WHERE v.codigo = d.codigo)
+                GROUP BY d.curso_id
+            )
+            SELECT v.curso_id, v.linha, v.codigo, v.carga_horaria,
+                   c.carga_horaria_total AS total, coalesce(b.soma, 0) AS inicial,
+                   row_number() OVER (PARTITION BY v.curso_id ORDER BY v.linha) AS n
+            FROM validos v
+            JOIN cursos c ON c.id = v.curso_id
+            LEFT JOIN base b ON b.curso_id = v.curso_id
+            WHERE v.ativo
+        """)
+        cursor.execute(f'CREATE INDEX ON {orcamento} (curso_id, n)')
+        cursor.execute(f'ANALYZE {orcamento}')
+        cursor.execute(f"""
+            WITH RECURSIVE acumulado AS (
+                SELECT o.curso_id, o.n, o.linha, o.codigo, o.total,
+                       o.inicial + o.carga_horaria AS tentativa,
+                       CASE WHEN o.inicial + o.carga_horaria <= o.total
+                            THEN o.inicial + o.carga_horaria ELSE o.inicial END AS soma
+                FROM {orcamento} o
+                WHERE o.n = 1
+                UNION ALL
+                SELECT o.curso_id, o.n, o.linha, o.codigo, o.total,
+                       a.soma + o.carga_horaria,
+                       CASE WHEN a.soma + o.carga_horaria <= o.total
+                            THEN a.soma + o.carga_horaria ELSE a.soma END
+                FROM acumulado a
+                JOIN {orcamento} o ON o.curso_id = a.curso_id AND o.n = a.n + 1
+            )
+            INSERT INTO {rejeitos} (arquivo, linha, codigo, motivo)
+            SELECT 'disciplinas', linha, codigo, format(
+                'A soma das cargas horárias das disciplinas (%s) '
+                'não pode ultrapassar a carga horária total do curso (%s)', tentativa, total
+            )
+            FROM acumulado
+            WHERE tentativa > total
+        """)
+
+        cursor.execute(f"""
+            UPDATE disciplinas d
+            SET nome = v.nome, carga_horaria = v.carga_horaria,
+                curso_id = v.curso_id, ativo = v.ativo
+            FROM ({validos}) v
+            WHERE d.codigo = v.codigo
+        """)
+        self.estatisticas['disciplinas_atualizadas'] = cursor.rowcount
+        cursor.execute(f"""
+            INSERT INTO disciplinas (id, codigo, nome, carga_horaria, curso_id, ativo)
+            SELECT {UUID7_SQL}, v.codigo, v.nome, v.carga_horaria, v.curso_id, v.ativo
+            FROM ({validos}) v
+            WHERE NOT EXISTS (SELECT 1 FROM disciplinas d WHERE d.codigo = v.codigo)
+        """)
+        self.estatisticas['disciplinas_inseridas'] = cursor.rowcount
+
+    def _exportar_rejeitos(self, cursor):
+        rejeitos = self.tabelas['rejeitos']
+        cursor.execute(f'SELECT count(*) FROM {rejeitos}')
+        self.estatisticas['rejeitadas'] = cursor.fetchone()[0]
+        if self.rejeitos is not None:
+            cursor.copy_expert(
+                f'COPY (SELECT arquivo, linha, codigo, motivo FROM {rejeitos} '
+                'ORDER BY arquivo, linha) TO STDOUT WITH (FORMAT csv, HEADER)',
+                self.rejeitos,
+            )
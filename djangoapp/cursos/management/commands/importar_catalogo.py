@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from cursos.importacao import ArquivoInvalido, ImportacaoCatalogo
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa cursos e disciplinas de arquivos CSV ou NDJSON (.ndjson/.jsonl) '
+        'via COPY, casando registros pelo codigo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cursos', help='Arquivo de cursos.')
+        parser.add_argument('--disciplinas', help='Arquivo de disciplinas (curso_codigo).')
+        parser.add_argument('--rejeitos', help='CSV onde gravar as linhas rejeitadas.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Valida e simula a mesclagem sem gravar nada.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('A importação usa COPY e exige PostgreSQL.')
+        if not options['cursos'] and not options['disciplinas']:
+            raise CommandError('Informe --cursos e/ou --disciplinas.')
+
+        arquivos = {}
+        rejeitos = None
+        try:
+            for tipo in ('cursos', 'disciplinas'):
+                if options[tipo]:
+                    arquivos[tipo] = open(options[tipo], 'rb')
+            if options['rejeitos']:
+                rejeitos = open(options['rejeitos'], 'w', encoding='utf-8', newline='')
+
+            importacao = ImportacaoCatalogo(rejeitos=rejeitos, dry_run=options['dry_run'])
+            estatisticas = importacao.executar(**arquivos)
+        except ArquivoInvalido as exc:
+            raise CommandError(str(exc))
+        finally:
+            for arquivo in arquivos.values():
+                arquivo.close()
+            if rejeitos is not None:
+                rejeitos.close()
+
+        prefixo = '[dry-run] ' if options['dry_run'] else ''
+        self.stdout.write(
+            f'{prefixo}{estatisticas["lidas"]} linhas lidas, '
+            f'{estatisticas["rejeitadas"]} rejeitadas'
+        )
+        self.stdout.write(
+            f'{prefixo}Cursos: {estatisticas["cursos_inseridos"]} inseridos, '
+            f'{estatisticas["cursos_atualizados"]} atualizados'
+        )
+        self.stdout.write(
+            f'{prefixo}Disciplinas: {estatisticas["disciplinas_inseridas"]} inseridas, '
+            f'{estatisticas["disciplinas_atualizadas"]} atualizadas'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefixo}{estatisticas["segundos"]:.2f}s, '
+            f'{estatisticas["linhas_por_segundo"]:,.0f} linhas/s'
+        ))
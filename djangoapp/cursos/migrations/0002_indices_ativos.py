@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-19 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['codigo'], name='cursos_codigo_ativos_idx'),
+        ),
+    ]
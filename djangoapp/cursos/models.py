@@ -1,20 +1,64 @@
 from django.db import models
 from django.core.exceptions import ValidationError
-import uuid
+from django.db.models.functions import Coalesce
+from api.ids import uuid7
+from api.integridade import RestricoesMixin
+from api.transicoes import alterar_ativo
 
 
-class Curso(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+class CursoQuerySet(models.QuerySet):
+    def com_agregados(self):
+        """Anota o total e a soma de carga horária das disciplinas ativas."""
+        from disciplinas.models import Disciplina
+
+        ativas = Disciplina.objects.filter(curso=models.OuterRef('pk'), ativo=True)
+        ativas = ativas.order_by().values('curso')
+        return self.annotate(
+            _total_disciplinas_ativas=Coalesce(
+                models.Subquery(ativas.annotate(total=models.Count('pk')).values('total')), 0
+            ),
+            _soma_carga_horaria_disciplinas_ativas=Coalesce(
+                models.Subquery(ativas.annotate(soma=models.Sum('carga_horaria')).values('soma')), 0
+            ),
+        )
+
+    def com_disciplinas(self, ativo=None, limite=None):
+        """Pré-carrega as disciplinas de cada curso em ``disciplinas_incluidas``.
+
+        Uma única consulta para todos os cursos; ``limite`` vale por curso.
+        """
+        from disciplinas.models import Disciplina
+
+        disciplinas = Disciplina.objects.order_by('codigo')
+        if ativo is not None:
+            disciplinas = disciplinas.filter(ativo=ativo)
+        if limite is not None:
+            disciplinas = disciplinas[:limite]
+        return self.prefetch_related(
+            models.Prefetch('disciplinas', queryset=disciplinas, to_attr='disciplinas_incluidas')
+        )
+
+
+class Curso(RestricoesMixin, models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     codigo = models.CharField(max_length=50, unique=True)
     nome = models.CharField(max_length=255)
     descricao = models.TextField(blank=True, null=True)
     ativo = models.BooleanField(default=True)
     carga_horaria_total = models.IntegerField()
 
+    objects = CursoQuerySet.as_manager()
+
     class Meta:
         db_table = 'cursos'
         verbose_name = 'Curso'
         verbose_name_plural = 'Cursos'
+        indexes = [
+            models.Index(
+                fields=['codigo'], name='cursos_codigo_ativos_idx',
+                condition=models.Q(ativo=True)
+            ),
+        ]
 
     def clean(self):
         super().clean()
@@ -27,18 +71,43 @@ class Curso(models.Model):
             raise ValidationError(f'Já existe um curso ativo com o código {self.codigo}')
 
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.clean_fields()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def alterar_ativo(cls, pk, ativo, queryset=None):
+        return alterar_ativo(
+            cls, pk, ativo,
+            guarda=(
+                'NOT EXISTS (SELECT 1 FROM cursos o '
+                'WHERE o.codigo = t.codigo AND o.ativo AND o.id <> t.id)'
+            ),
+            extras={
+                '_total_disciplinas_ativas': (
+                    '(SELECT count(*) FROM disciplinas d '
+                    'WHERE d.curso_id = t.id AND d.ativo)'
+                ),
+                '_soma_carga_horaria_disciplinas_ativas': (
+                    '(SELECT coalesce(sum(d.carga_horaria), 0) FROM disciplinas d '
+                    'WHERE d.curso_id = t.id AND d.ativo)'
+                ),
+            },
+            queryset=queryset,
+        )
+
     def __str__(self):
         return f'{self.codigo} - {self.nome}'
 
     @property
     def total_disciplinas_ativas(self):
+        if hasattr(self, '_total_disciplinas_ativas'):
+            return self._total_disciplinas_ativas
         return self.disciplinas.filter(ativo=True).count()
 
     @property
     def soma_carga_horaria_disciplinas_ativas(self):
+        if hasattr(self, '_soma_carga_horaria_disciplinas_ativas'):
+            return self._soma_carga_horaria_disciplinas_ativas
         return self.disciplinas.filter(ativo=True).aggregate(
             total=models.Sum('carga_horaria')
         )['total'] or 0
@@ -1,7 +1,26 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from disciplinas.models import Disciplina
+from .cache import get_cache_cursos
 from .models import Curso
 
 
+class CursoEmCacheField(serializers.PrimaryKeyRelatedField):
+    """Chave de curso resolvida pelo cache de cursos em vez de um SELECT."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Curso.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            return get_cache_cursos().obter(Curso._meta.pk.to_python(data))
+        except Curso.DoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
 class CursoSerializer(serializers.ModelSerializer):
     total_disciplinas_ativas = serializers.ReadOnlyField()
     soma_carga_horaria_disciplinas_ativas = serializers.ReadOnlyField()
@@ -12,6 +31,25 @@ class CursoSerializer(serializers.ModelSerializer):
             'id', 'codigo', 'nome', 'descricao', 'ativo', 'carga_horaria_total',
             'total_disciplinas_ativas', 'soma_carga_horaria_disciplinas_ativas'
         ]
+        extra_kwargs = {
+            'codigo': {'validators': []},
+        }
+
+
+class DisciplinaIncluidaSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Disciplina
+        fields = ['id', 'codigo', 'nome', 'carga_horaria', 'ativo']
+
+
+class CursoComDisciplinasSerializer(CursoSerializer):
+    disciplinas = DisciplinaIncluidaSerializer(
+        source='disciplinas_incluidas', many=True, read_only=True
+    )
+
+    class Meta(CursoSerializer.Meta):
+        fields = CursoSerializer.Meta.fields + ['disciplinas']
 
 
 class CursoListSerializer(serializers.ModelSerializer):
@@ -27,4 +65,29 @@ class CursoResumoSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Curso
-        fields = ['total_disciplinas_ativas', 'soma_carga_horaria_disciplinas_ativas']
\ No newline at end of file
+        fields = ['total_disciplinas_ativas', 'soma_carga_horaria_disciplinas_ativas']
+
+class OperacaoSimulacaoSerializer(serializers.Serializer):
+    CAMPOS = {
+        'adicionar': ('curso', 'carga_horaria'),
+        'remover': ('disciplina',),
+        'mover': ('disciplina', 'curso'),
+        'alterar': ('disciplina', 'carga_horaria'),
+    }
+
+    tipo = serializers.ChoiceField(choices=list(CAMPOS))
+    curso = serializers.UUIDField(required=False)
+    disciplina = serializers.UUIDField(required=False)
+    carga_horaria = serializers.IntegerField(required=False, min_value=0)
+
+    def validate(self, attrs):
+        faltando = [campo for campo in self.CAMPOS[attrs['tipo']] if campo not in attrs]
+        if faltando:
+            raise serializers.ValidationError({
+                campo: ['Obrigatório para este tipo de operação.'] for campo in faltando
+            })
+        return {campo: attrs[campo] for campo in ('tipo', *self.CAMPOS[attrs['tipo']])}
+
+
+class SimulacaoSerializer(serializers.Serializer):
+    operacoes = OperacaoSimulacaoSerializer(many=True, allow_empty=False, max_length=1000)
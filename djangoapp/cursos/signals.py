@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidar_curso
+from .models import Curso
+
+
+@receiver(post_save, sender=Curso)
+def invalidar_save(sender, instance, using, **kwargs):
+    invalidar_curso(instance.pk, using)
+
+
+@receiver(post_delete, sender=Curso)
+def invalidar_delete(sender, instance, using, **kwargs):
+    invalidar_curso(instance.pk, using)
@@ -0,0 +1,106 @@
+from rest_framework.exceptions import ValidationError
+
+from disciplinas.models import Disciplina
+from .models import Curso
+
+
+def simular(operacoes):
+    """Aplica as operações sobre as alocações atuais sem gravar nada.
+
+    São duas consultas: as disciplinas citadas e os cursos afetados com os
+    agregados atuais (``com_agregados``). As operações são aplicadas em ordem
+    sobre esse estado em memória e cada curso recebe os totais resultantes e
+    as violações das regras de ``Disciplina.clean``.
+    """
+    ids = {op['disciplina'] for op in operacoes if 'disciplina' in op}
+    originais = {
+        pk: {'curso': curso, 'carga_horaria': carga, 'ativo': ativo}
+        for pk, curso, carga, ativo in Disciplina.objects.filter(pk__in=ids).values_list(
+            'pk', 'curso_id', 'carga_horaria', 'ativo'
+        )
+    }
+    erros = {
+        i: [f'Disciplina {op["disciplina"]} não encontrada.']
+        for i, op in enumerate(operacoes)
+        if 'disciplina' in op and op['disciplina'] not in originais
+    }
+
+    cursos_ids = {op['curso'] for op in operacoes if 'curso' in op}
+    cursos_ids |= {disciplina['curso'] for disciplina in originais.values()}
+    cursos = {
+        curso['id']: curso
+        for curso in Curso.objects.filter(pk__in=cursos_ids).com_agregados().values(
+            'id', 'codigo', 'carga_horaria_total', 'ativo',
+            '_total_disciplinas_ativas', '_soma_carga_horaria_disciplinas_ativas',
+        )
+    }
+    for i, op in enumerate(operacoes):
+        if 'curso' in op and op['curso'] not in cursos:
+            erros.setdefault(i, []).append(f'Curso {op["curso"]} não encontrado.')
+    if erros:
+        raise ValidationError({'operacoes': erros})
+
+    estado = {pk: dict(disciplina) for pk, disciplina in originais.items()}
+    novas = []
+    inativos = set()
+    for op in operacoes:
+        if op['tipo'] == 'adicionar':
+            disciplina = {'curso': op['curso'], 'carga_horaria': op['carga_horaria'], 'ativo': True}
+            novas.append(disciplina)
+        else:
+            disciplina = estado[op['disciplina']]
+            if op['tipo'] == 'remover':
+                disciplina['ativo'] = False
+            elif op['tipo'] == 'mover':
+                disciplina['curso'] = op['curso']
+            else:
+                disciplina['carga_horaria'] = op['carga_horaria']
+        if op['tipo'] in ('adicionar', 'mover') and disciplina['ativo']:
+            if not cursos[disciplina['curso']]['ativo']:
+                inativos.add(disciplina['curso'])
+
+    totais = {
+        pk: [curso['_total_disciplinas_ativas'], curso['_soma_carga_horaria_disciplinas_ativas']]
+        for pk, curso in cursos.items()
+    }
+
+    def contar(disciplinas, sinal):
+        for disciplina in disciplinas:
+            if disciplina['ativo']:
+                totais[disciplina['curso']][0] += sinal
+                totais[disciplina['curso']][1] += sinal * disciplina['carga_horaria']
+
+    contar(originais.values(), -1)
+    contar([*estado.values(), *novas], 1)
+
+    resultado = []
+    for pk, curso in cursos.items():
+        total, soma = totais[pk]
+        violacoes = []
+        if pk in inativos:
+            violacoes.append('Não é possível adicionar disciplina a um curso inativado')
+        if soma > curso['carga_horaria_total']:
+            violacoes.append(
+                f'A soma das cargas horárias das disciplinas ({soma}) '
+                f'não pode ultrapassar a carga horária total do curso ({curso["carga_horaria_total"]})'
+            )
+        resultado.append({
+            'id': pk,
+            'codigo': curso['codigo'],
+            'carga_horaria_total': curso['carga_horaria_total'],
+            'atual': {
+                'total_disciplinas_ativas': curso['_total_disciplinas_ativas'],
+                'soma_carga_horaria_disciplinas_ativas': curso['_soma_carga_horaria_disciplinas_ativas'],
+            },
+            'simulado': {
+                'total_disciplinas_ativas': total,
+                'soma_carga_horaria_disciplinas_ativas': soma,
+            },
+            'disponivel': curso['carga_horaria_total'] - soma,
+            'violacoes': violacoes,
+        })
+    resultado.sort(key=lambda curso: curso['codigo'])
+    return {
+        'valido': not any(curso['violacoes'] for curso in resultado),
+        'cursos': resultado,
+    }
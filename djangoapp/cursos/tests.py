@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from .cache import CacheCursos
+from .models import Curso
+
+
+class CacheCursosTests(TransactionTestCase):
+
+    def setUp(self):
+        self.curso = Curso.objects.create(codigo='C1', nome='Alfa', carga_horaria_total=100)
+        self.cache = CacheCursos(tamanho=8, ttl=60)
+
+    def test_guarda_leitura_fora_de_transacao(self):
+        self.cache.obter(self.curso.pk)
+        self.cache.obter(self.curso.pk)
+        self.assertEqual(self.cache.estatisticas()['acertos'], 1)
+
+    def test_rollback_nao_deixa_valor_fantasma(self):
+        with transaction.atomic():
+            Curso.objects.filter(pk=self.curso.pk).update(nome='Zeta')
+            self.assertEqual(self.cache.obter(self.curso.pk).nome, 'Zeta')
+            transaction.set_rollback(True)
+        self.assertNotIn(self.curso.pk, self.cache.entradas)
+        self.assertEqual(self.cache.obter(self.curso.pk).nome, 'Alfa')
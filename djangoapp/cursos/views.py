@@ -1,43 +1,105 @@
-from rest_framework import viewsets, status, filters
+from rest_framework import viewsets, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import connection
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Curso
-from .serializers import CursoSerializer, CursoListSerializer, CursoResumoSerializer
+from .serializers import (
+    CursoSerializer, CursoListSerializer, CursoResumoSerializer, CursoComDisciplinasSerializer,
+    SimulacaoSerializer,
+)
+from .cache import get_cache_cursos
+from .simulacao import simular
 from perfis.permissions import IsGerente
+from tarefas.operacoes import salvar_upload
+from api.mixins import (
+    AtivacaoMixin, AutocompletarMixin, CamposMixin, FacetasMixin, LeituraEmLoteMixin,
+    TarefasMixin,
+)
 
-class CursoViewSet(viewsets.ModelViewSet):
+class CursoViewSet(
+    CamposMixin, AtivacaoMixin, AutocompletarMixin, FacetasMixin, LeituraEmLoteMixin,
+    TarefasMixin, viewsets.ModelViewSet,
+):
     queryset = Curso.objects.all()
     permission_classes = [IsGerente]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['ativo', 'codigo']
     search_fields = ['nome', 'codigo', 'descricao']
     ordering_fields = ['codigo', 'nome', 'carga_horaria_total']
+    facetas = ['ativo']
+    campos_exportacao = ['codigo', 'nome', 'descricao', 'carga_horaria_total', 'ativo']
     ordering = ['codigo']
 
+    @property
+    def anotacoes(self):
+        anotacoes = {
+            'total_disciplinas_ativas': 'com_agregados',
+            'soma_carga_horaria_disciplinas_ativas': 'com_agregados',
+        }
+        if 'disciplinas' in self.inclusoes():
+            ativo, limite = self.filtros_inclusao()
+            anotacoes['disciplinas'] = lambda queryset: queryset.com_disciplinas(ativo, limite)
+        return anotacoes
+
+    def inclusoes(self):
+        """``?include=disciplinas`` embute as disciplinas de cada curso."""
+        valor = self.request.query_params.get('include') if self.request else None
+        if not valor or self.action not in self.acoes_de_leitura:
+            return set()
+        inclusoes = set(valor.split(','))
+        if inclusoes - {'disciplinas'}:
+            raise ValidationError({'include': ['Inclusões disponíveis: disciplinas.']})
+        return inclusoes
+
+    def filtros_inclusao(self):
+        parametros = self.request.query_params
+        ativo = parametros.get('disciplinas_ativo')
+        if ativo is not None:
+            if ativo not in ('true', 'false'):
+                raise ValidationError({'disciplinas_ativo': ['Use true ou false.']})
+            ativo = ativo == 'true'
+        try:
+            limite = int(parametros.get('disciplinas_limite', settings.INCLUSOES['LIMITE']))
+        except ValueError:
+            raise ValidationError({'disciplinas_limite': ['Informe um número inteiro.']})
+        return ativo, max(0, min(limite, settings.INCLUSOES['LIMITE']))
+
     def get_serializer_class(self):
+        if self.inclusoes():
+            return CursoComDisciplinasSerializer
         if self.action == 'list':
             return CursoListSerializer
         return CursoSerializer
 
-    @action(detail=True, methods=['patch'])
-    def inativar(self, request, pk=None):
-        curso = self.get_object()
-        curso.ativo = False
-        curso.save()
-        serializer = self.get_serializer(curso)
-        return Response(serializer.data)
-
-    @action(detail=True, methods=['patch'])
-    def ativar(self, request, pk=None):
-        curso = self.get_object()
-        curso.ativo = True
-        curso.save()
-        serializer = self.get_serializer(curso)
-        return Response(serializer.data)
-
     @action(detail=True, methods=['get'])
     def resumo(self, request, pk=None):
         curso = self.get_object()
         serializer = CursoResumoSerializer(curso)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def cache(self, request):
+        return Response(get_cache_cursos().estatisticas())
+
+    @action(detail=False, methods=['post'])
+    def simular(self, request):
+        serializer = SimulacaoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(simular(serializer.validated_data['operacoes']))
+
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def importar(self, request):
+        if connection.vendor != 'postgresql':
+            raise ValidationError('A importação usa COPY e exige PostgreSQL.')
+        arquivos = {
+            tipo: salvar_upload(request.FILES[tipo], tipo)
+            for tipo in ('cursos', 'disciplinas') if tipo in request.FILES
+        }
+        if not arquivos:
+            raise ValidationError('Envie o arquivo de cursos e/ou de disciplinas.')
+        dry_run = request.data.get('dry_run', '').lower() in ('1', 'true', 'sim')
+        return self.enfileirar('importar_catalogo', {'arquivos': arquivos, 'dry_run': dry_run})
@@ -1,10 +1,13 @@
 from django.contrib import admin
+from api.admin import CatalogoAdminMixin
 from .models import Disciplina
 
 
 @admin.register(Disciplina)
-class DisciplinaAdmin(admin.ModelAdmin):
+class DisciplinaAdmin(CatalogoAdminMixin, admin.ModelAdmin):
     list_display = ('codigo', 'nome', 'curso', 'carga_horaria', 'ativo')
-    list_filter = ('ativo', 'curso')
+    list_filter = ('ativo',)
+    list_select_related = ('curso',)
+    autocomplete_fields = ('curso',)
     search_fields = ('codigo', 'nome', 'curso__nome', 'curso__codigo')
-    ordering = ('codigo',)
\ No newline at end of file
+    ordering = ('codigo',)
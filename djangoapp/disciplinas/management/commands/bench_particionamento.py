@@ -0,0 +1,110 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+ESQUEMA = 'bench_particionamento'
+
+CRIAR = """
+CREATE SCHEMA {esquema};
+
+CREATE TABLE {esquema}.plana (
+    id uuid PRIMARY KEY,
+    codigo varchar(50) NOT NULL UNIQUE,
+    nome varchar(255) NOT NULL,
+    carga_horaria integer NOT NULL,
+    ativo boolean NOT NULL,
+    curso_id uuid NOT NULL
+);
+CREATE INDEX ON {esquema}.plana (curso_id);
+
+CREATE TABLE {esquema}.particionada (
+    id uuid NOT NULL,
+    codigo varchar(50) NOT NULL,
+    nome varchar(255) NOT NULL,
+    carga_horaria integer NOT NULL,
+    ativo boolean NOT NULL,
+    curso_id uuid NOT NULL,
+    PRIMARY KEY (id, ativo),
+    UNIQUE (codigo, ativo)
+) PARTITION BY LIST (ativo);
+CREATE TABLE {esquema}.particionada_ativas
+    PARTITION OF {esquema}.particionada FOR VALUES IN (true);
+CREATE TABLE {esquema}.particionada_inativas
+    PARTITION OF {esquema}.particionada FOR VALUES IN (false);
+CREATE INDEX ON {esquema}.particionada (curso_id);
+
+CREATE TABLE {esquema}.cursos AS
+    SELECT n, gen_random_uuid() AS id FROM generate_series(0, %(cursos)s - 1) AS n;
+
+INSERT INTO {esquema}.plana
+    SELECT gen_random_uuid(), 'DISC' || i, 'Disciplina ' || i, 40 + i %% 5 * 20,
+           random() >= %(inativas)s, c.id
+    FROM generate_series(1, %(linhas)s) AS i
+    JOIN {esquema}.cursos c ON c.n = i %% %(cursos)s;
+INSERT INTO {esquema}.particionada SELECT * FROM {esquema}.plana;
+"""
+
+CONSULTAS = {
+    'página de ativas': (
+        'SELECT * FROM {tabela} WHERE ativo ORDER BY codigo LIMIT 20'
+    ),
+    'COUNT da paginação': 'SELECT count(*) FROM {tabela} WHERE ativo',
+    'busca ILIKE em ativas': (
+        "SELECT count(*) FROM {tabela} WHERE ativo AND nome ILIKE '%123%'"
+    ),
+    'unicidade de codigo ativo': (
+        "SELECT 1 FROM {tabela} WHERE codigo = 'DISC4242' AND ativo LIMIT 1"
+    ),
+    'carga horária do curso': (
+        'SELECT sum(carga_horaria) FROM {tabela} '
+        'WHERE ativo AND curso_id = (SELECT id FROM {esquema}.cursos LIMIT 1)'
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compara tabela plana x particionada por ativo num dataset com 90% de inativas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=1_000_000)
+        parser.add_argument('--cursos', type=int, default=2_000)
+        parser.add_argument('--inativas', type=float, default=0.9)
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Benchmark disponível apenas no PostgreSQL.')
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE')
+            self.stdout.write(f'Carregando {options["linhas"]} linhas...')
+            try:
+                cursor.execute(CRIAR.format(esquema=ESQUEMA), options)
+                for tabela in ('plana', 'particionada'):
+                    cursor.execute(f'VACUUM ANALYZE {ESQUEMA}.{tabela}')
+                for nome, consulta in CONSULTAS.items():
+                    self.stdout.write(f'\n{nome}')
+                    for tabela in ('plana', 'particionada'):
+                        tempo, buffers = self.medir(
+                            cursor,
+                            consulta.format(tabela=f'{ESQUEMA}.{tabela}', esquema=ESQUEMA),
+                            options['repeticoes'],
+                        )
+                        self.stdout.write(
+                            f'  {tabela:13} {tempo:9.3f} ms  {buffers:8} buffers'
+                        )
+            finally:
+                cursor.execute(f'DROP SCHEMA {ESQUEMA} CASCADE')
+
+    def medir(self, cursor, consulta, repeticoes):
+        tempos = []
+        for _ in range(repeticoes):
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {consulta}')
+            plano = cursor.fetchone()[0]
+            if isinstance(plano, str):
+                plano = json.loads(plano)
+            tempos.append(plano[0]['Execution Time'])
+            raiz = plano[0]['Plan']
+            buffers = raiz.get('Shared Hit Blocks', 0) + raiz.get('Shared Read Blocks', 0)
+        return sorted(tempos)[len(tempos) // 2], buffers
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from disciplinas.models import Disciplina
+
+
+class Command(BaseCommand):
+    help = 'Mostra as partições de disciplinas e confirma o pruning por ativo.'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Particionamento disponível apenas no PostgreSQL.')
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT c.relname, pg_get_expr(c.relpartbound, c.oid),
+                       c.reltuples::bigint, pg_total_relation_size(c.oid)
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'disciplinas'::regclass
+                ORDER BY c.relname
+            """)
+            particoes = cursor.fetchall()
+
+        if not particoes:
+            raise CommandError('A tabela disciplinas não está particionada.')
+
+        for nome, limite, linhas, tamanho in particoes:
+            self.stdout.write(f'{nome:24} {limite:24} ~{linhas} linhas  {tamanho / 1024:.0f} KiB')
+
+        plano = Disciplina.objects.filter(ativo=True).explain()
+        self.stdout.write('\nPlano de ?ativo=true:')
+        self.stdout.write(plano)
+        if 'disciplinas_inativas' in plano:
+            self.stderr.write(self.style.WARNING('A partição de inativas não foi podada.'))
@@ -0,0 +1,102 @@
+from django.db import migrations
+
+# Particiona ``disciplinas`` por LIST (ativo): as linhas inativas ficam em
+# ``disciplinas_inativas`` e as consultas com ``ativo = true`` leem apenas a
+# partição pequena. Um UPDATE de ``ativo`` move a linha entre as partições.
+#
+# A chave primária e o índice único de ``codigo`` precisam incluir a chave de
+# partição; a unicidade global de ``codigo`` continua garantida por trigger.
+
+PARTICIONAR = """
+CREATE TABLE disciplinas_particionada (
+    id uuid NOT NULL,
+    codigo varchar(50) NOT NULL,
+    nome varchar(255) NOT NULL,
+    carga_horaria integer NOT NULL,
+    ativo boolean NOT NULL,
+    curso_id uuid NOT NULL
+) PARTITION BY LIST (ativo);
+
+CREATE TABLE disciplinas_ativas
+    PARTITION OF disciplinas_particionada FOR VALUES IN (true);
+CREATE TABLE disciplinas_inativas
+    PARTITION OF disciplinas_particionada FOR VALUES IN (false);
+
+INSERT INTO disciplinas_particionada (id, codigo, nome, carga_horaria, ativo, curso_id)
+    SELECT id, codigo, nome, carga_horaria, ativo, curso_id FROM disciplinas;
+
+DROP TABLE disciplinas;
+ALTER TABLE disciplinas_particionada RENAME TO disciplinas;
+
+ALTER TABLE disciplinas
+    ADD CONSTRAINT disciplinas_pkey PRIMARY KEY (id, ativo);
+ALTER TABLE disciplinas
+    ADD CONSTRAINT disciplinas_codigo_ativo_key UNIQUE (codigo, ativo);
+ALTER TABLE disciplinas
+    ADD CONSTRAINT disciplinas_curso_id_fk_cursos_id FOREIGN KEY (curso_id)
+    REFERENCES cursos (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX disciplinas_curso_id_idx ON disciplinas (curso_id);
+CREATE INDEX disciplinas_codigo_like_idx ON disciplinas (codigo varchar_pattern_ops);
+
+CREATE FUNCTION disciplinas_codigo_unico() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('disciplinas.codigo'), hashtext(NEW.codigo));
+    IF EXISTS (SELECT 1 FROM disciplinas WHERE codigo = NEW.codigo AND id <> NEW.id) THEN
+        RAISE unique_violation USING
+            MESSAGE = 'duplicate key value violates unique constraint "disciplinas_codigo_key"',
+            DETAIL = format('Key (codigo)=(%s) already exists.', NEW.codigo),
+            CONSTRAINT = 'disciplinas_codigo_key',
+            TABLE = 'disciplinas';
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER disciplinas_codigo_unico
+    BEFORE INSERT OR UPDATE OF codigo ON disciplinas
+    FOR EACH ROW EXECUTE FUNCTION disciplinas_codigo_unico();
+"""
+
+DESPARTICIONAR = """
+CREATE TABLE disciplinas_plana (
+    id uuid NOT NULL PRIMARY KEY,
+    codigo varchar(50) NOT NULL UNIQUE,
+    nome varchar(255) NOT NULL,
+    carga_horaria integer NOT NULL,
+    ativo boolean NOT NULL,
+    curso_id uuid NOT NULL
+);
+
+INSERT INTO disciplinas_plana (id, codigo, nome, carga_horaria, ativo, curso_id)
+    SELECT id, codigo, nome, carga_horaria, ativo, curso_id FROM disciplinas;
+
+DROP TABLE disciplinas;
+DROP FUNCTION disciplinas_codigo_unico();
+ALTER TABLE disciplinas_plana RENAME TO disciplinas;
+ALTER INDEX disciplinas_plana_pkey RENAME TO disciplinas_pkey;
+ALTER INDEX disciplinas_plana_codigo_key RENAME TO disciplinas_codigo_key;
+
+ALTER TABLE disciplinas
+    ADD CONSTRAINT disciplinas_curso_id_fk_cursos_id FOREIGN KEY (curso_id)
+    REFERENCES cursos (id) DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX disciplinas_curso_id_idx ON disciplinas (curso_id);
+CREATE INDEX disciplinas_codigo_like_idx ON disciplinas (codigo varchar_pattern_ops);
+"""
+
+
+def executar(sql):
+    def operacao(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(sql, params=None)
+    return operacao
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('disciplinas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(executar(PARTICIONAR), executar(DESPARTICIONAR)),
+    ]
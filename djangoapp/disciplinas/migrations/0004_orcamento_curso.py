@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# Regras de ``Disciplina.clean`` que dependem de outras linhas passam a ser
+# garantidas pelo banco: o curso precisa estar ativo e a soma das cargas
+# horárias das disciplinas ativas não pode ultrapassar a do curso.
+#
+# O trigger trava a linha do curso (FOR NO KEY UPDATE, compatível com as
+# checagens de FK), então escritas concorrentes no mesmo curso são
+# serializadas e a soma sempre enxerga as disciplinas já confirmadas. É
+# DEFERRABLE para que cargas em lote possam adiar a checagem para o commit.
+
+CRIAR = """
+CREATE FUNCTION disciplinas_orcamento_curso() RETURNS trigger AS $$
+DECLARE
+    curso cursos%ROWTYPE;
+    soma integer;
+BEGIN
+    SELECT * INTO curso FROM cursos WHERE id = NEW.curso_id FOR NO KEY UPDATE;
+    IF NOT curso.ativo THEN
+        RAISE check_violation USING
+            MESSAGE = 'Não é possível adicionar disciplina a um curso inativado',
+            CONSTRAINT = 'disciplinas_curso_ativo',
+            TABLE = 'disciplinas';
+    END IF;
+
+    SELECT coalesce(sum(carga_horaria), 0) INTO soma
+        FROM disciplinas WHERE curso_id = NEW.curso_id AND ativo;
+    IF soma > curso.carga_horaria_total THEN
+        RAISE check_violation USING
+            MESSAGE = format(
+                'A soma das cargas horárias das disciplinas (%s) não pode '
+                'ultrapassar a carga horária total do curso (%s)',
+                soma, curso.carga_horaria_total
+            ),
+            CONSTRAINT = 'disciplinas_orcamento_curso',
+            TABLE = 'disciplinas';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE CONSTRAINT TRIGGER disciplinas_orcamento_curso
+    AFTER INSERT OR UPDATE OF ativo, carga_horaria, curso_id ON disciplinas
+    DEFERRABLE INITIALLY IMMEDIATE
+    FOR EACH ROW WHEN (NEW.ativo)
+    EXECUTE FUNCTION disciplinas_orcamento_curso();
+"""
+
+REMOVER = """
+DROP TRIGGER disciplinas_orcamento_curso ON disciplinas;
+DROP FUNCTION disciplinas_orcamento_curso();
+"""
+
+
+def executar(sql):
+    def operacao(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(sql, params=None)
+    return operacao
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cursos', '0003_ids_uuid7'),
+        ('disciplinas', '0003_ids_uuid7'),
+    ]
+
+    operations = [
+        migrations.RunPython(executar(CRIAR), executar(REMOVER)),
+    ]
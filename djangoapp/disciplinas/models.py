@@ -1,10 +1,13 @@
 from django.db import models
 from django.core.exceptions import ValidationError
-import uuid
+from api.ids import uuid7
+from api.integridade import RestricoesMixin
+from api.transicoes import alterar_ativo
+from cursos.cache import get_cache_cursos
 
 
-class Disciplina(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+class Disciplina(RestricoesMixin, models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     codigo = models.CharField(max_length=50, unique=True)
     nome = models.CharField(max_length=255)
     carga_horaria = models.IntegerField()
@@ -31,25 +34,50 @@ class Disciplina(models.Model):
         if existing.exists():
             raise ValidationError(f'Já existe uma disciplina ativa com o código {self.codigo}')
 
-        if self.curso and not self.curso.ativo:
+        curso = self.curso_em_cache()
+        if curso and not curso.ativo:
             raise ValidationError('Não é possível adicionar disciplina a um curso inativado')
 
-        if self.curso:
-            outras_disciplinas_ativas = self.curso.disciplinas.filter(
+        if curso:
+            outras_disciplinas_ativas = curso.disciplinas.filter(
                 ativo=True
             ).exclude(pk=self.pk)
 
             soma_outras = sum(d.carga_horaria for d in outras_disciplinas_ativas)
 
-            if (soma_outras + self.carga_horaria) > self.curso.carga_horaria_total:
+            if (soma_outras + self.carga_horaria) > curso.carga_horaria_total:
                 raise ValidationError(
                     f'A soma das cargas horárias das disciplinas ({soma_outras + self.carga_horaria}) '
-                    f'não pode ultrapassar a carga horária total do curso ({self.curso.carga_horaria_total})'
+                    f'não pode ultrapassar a carga horária total do curso ({curso.carga_horaria_total})'
                 )
 
+    def curso_em_cache(self):
+        """O curso da disciplina, vindo do cache de cursos se ainda não carregado."""
+        if self.curso_id is None:
+            return None
+        if not Disciplina.curso.is_cached(self) or self.curso.pk != self.curso_id:
+            self.curso = get_cache_cursos().obter(self.curso_id)
+        return self.curso
+
     def save(self, *args, **kwargs):
-        self.full_clean()
+        self.clean_fields(exclude=['curso'])
         super().save(*args, **kwargs)
 
+    @classmethod
+    def alterar_ativo(cls, pk, ativo, queryset=None):
+        return alterar_ativo(
+            cls, pk, ativo,
+            guarda=(
+                'NOT EXISTS (SELECT 1 FROM disciplinas o '
+                'WHERE o.codigo = t.codigo AND o.ativo AND o.id <> t.id) '
+                'AND r_curso.ativo '
+                'AND r_curso.carga_horaria_total >= t.carga_horaria + ('
+                'SELECT coalesce(sum(o.carga_horaria), 0) FROM disciplinas o '
+                'WHERE o.curso_id = t.curso_id AND o.ativo AND o.id <> t.id)'
+            ),
+            relacionados=('curso',),
+            queryset=queryset,
+        )
+
     def __str__(self):
         return f'{self.codigo} - {self.nome}'
\ No newline at end of file
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Disciplina
-from cursos.serializers import CursoListSerializer
+from cursos.serializers import CursoEmCacheField, CursoListSerializer
 
 
 class DisciplinaSerializer(serializers.ModelSerializer):
+    curso = CursoEmCacheField()
     curso_detalhes = CursoListSerializer(source='curso', read_only=True)
 
     class Meta:
@@ -12,6 +13,14 @@ class DisciplinaSerializer(serializers.ModelSerializer):
             'id', 'codigo', 'nome', 'carga_horaria', 'curso',
             'curso_detalhes', 'ativo'
         ]
+        extra_kwargs = {
+            'codigo': {'validators': []},
+        }
+
+    def to_representation(self, instance):
+        if 'curso_detalhes' in self.fields:
+            instance.curso_em_cache()
+        return super().to_representation(instance)
 
 
 class DisciplinaListSerializer(serializers.ModelSerializer):
@@ -1,38 +1,29 @@
-from rest_framework import viewsets, status, filters
-from rest_framework.decorators import action
-from rest_framework.response import Response
+from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Disciplina
 from .serializers import DisciplinaSerializer, DisciplinaListSerializer
 from perfis.permissions import IsGerente
+from api.mixins import (
+    AtivacaoMixin, AutocompletarMixin, CamposMixin, FacetasMixin, LeituraEmLoteMixin,
+    TarefasMixin,
+)
 
 
-class DisciplinaViewSet(viewsets.ModelViewSet):
+class DisciplinaViewSet(
+    CamposMixin, AtivacaoMixin, AutocompletarMixin, FacetasMixin, LeituraEmLoteMixin,
+    TarefasMixin, viewsets.ModelViewSet,
+):
     queryset = Disciplina.objects.all()
     permission_classes = [IsGerente]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['ativo', 'curso']
     search_fields = ['nome', 'codigo']
     ordering_fields = ['codigo', 'nome', 'carga_horaria']
+    facetas = ['ativo', 'curso']
+    campos_exportacao = ['codigo', 'nome', 'carga_horaria', 'curso__codigo', 'ativo']
     ordering = ['codigo']
 
     def get_serializer_class(self):
         if self.action == 'list':
             return DisciplinaListSerializer
         return DisciplinaSerializer
-
-    @action(detail=True, methods=['patch'])
-    def inativar(self, request, pk=None):
-        disciplina = self.get_object()
-        disciplina.ativo = False
-        disciplina.save()
-        serializer = self.get_serializer(disciplina)
-        return Response(serializer.data)
-
-    @action(detail=True, methods=['patch'])
-    def ativar(self, request, pk=None):
-        disciplina = self.get_object()
-        disciplina.ativo = True
-        disciplina.save()
-        serializer = self.get_serializer(disciplina)
-        return Response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+
+class Evento:
+    __slots__ = ('seq', 'id', 'recurso', 'tipo', 'quadro')
+
+    def __init__(self, seq, id, recurso, tipo, dados):
+        self.seq = seq
+        self.id = id
+        self.recurso = recurso
+        self.tipo = tipo
+        nome = f'{recurso}.{tipo}' if recurso else tipo
+        corpo = json.dumps(dados, ensure_ascii=False, separators=(',', ':'))
+        self.quadro = f'id: {id}\nevent: {nome}\ndata: {corpo}\n\n'.encode()
+
+
+class Broker:
+    """Fan-out em memória dos eventos do catálogo para assinantes SSE.
+
+    Os eventos ficam num buffer circular compartilhado; cada assinante guarda
+    apenas a posição do último evento lido e dorme num ``asyncio.Event`` por
+    loop, de modo que uma conexão ociosa custa só a corrotina que a serve.
+    """
+
+    def __init__(self, tamanho_buffer=1000):
+        self._eventos = deque(maxlen=tamanho_buffer)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._ultimo_id = 0
+        self._sinais = {}
+        self._assinantes = {}
+
+    @property
+    def total_assinantes(self):
+        return sum(self._assinantes.values())
+
+    def proximo_id(self):
+        with self._lock:
+            return self._gerar_id()
+
+    def _gerar_id(self):
+        # Microssegundos desde a época: crescente no processo e comparável
+        # entre workers quando os eventos chegam pela ponte do PostgreSQL.
+        self._ultimo_id = max(time.time_ns() // 1000, self._ultimo_id + 1)
+        return self._ultimo_id
+
+    def publicar(self, recurso, tipo, dados, id=None):
+        with self._lock:
+            if id is None:
+                id = self._gerar_id()
+            else:
+                self._ultimo_id = max(self._ultimo_id, id)
+            self._seq += 1
+            evento = Evento(self._seq, id, recurso, tipo, dados)
+            self._eventos.append(evento)
+            loops = list(self._sinais)
+
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(self._acordar, loop)
+            except RuntimeError:
+                with self._lock:
+                    self._sinais.pop(loop, None)
+                    self._assinantes.pop(loop, None)
+        return evento
+
+    def _acordar(self, loop):
+        sinal = self._sinais.get(loop)
+        if sinal is not None:
+            self._sinais[loop] = asyncio.Event()
+            sinal.set()
+
+    def _pendentes(self, seq):
+        with self._lock:
+            novos = self._seq - seq
+            if novos <= 0:
+                return []
+            if novos > len(self._eventos):
+                return None
+            return [self._eventos[-i] for i in range(novos, 0, -1)]
+
+    def _desde_id(self, ultimo_id):
+        with self._lock:
+            eventos = list(self._eventos)
+            seq = self._seq
+        if eventos and eventos[0].id > ultimo_id and seq > len(eventos):
+            return None, seq
+        return [e for e in eventos if e.id > ultimo_id], seq
+
+    def _registrar(self, loop):
+        with self._lock:
+            self._sinais.setdefault(loop, asyncio.Event())
+            self._assinantes[loop] = self._assinantes.get(loop, 0) + 1
+
+    def _remover(self, loop):
+        with self._lock:
+            restantes = self._assinantes.get(loop, 0) - 1
+            if restantes > 0:
+                self._assinantes[loop] = restantes
+            else:
+                self._assinantes.pop(loop, None)
+                self._sinais.pop(loop, None)
+
+    async def assinar(self, recursos, ultimo_id=None, heartbeat=15):
+        """Gera eventos dos ``recursos`` indicados; ``None`` sinaliza heartbeat.
+
+        Com ``ultimo_id`` os eventos ainda presentes no buffer são reenviados
+        antes dos novos. Quando o assinante perde eventos (buffer esgotado) é
+        gerado um evento ``reset`` para que o cliente recarregue os dados.
+        """
+        loop = asyncio.get_running_loop()
+        self._registrar(loop)
+        try:
+            if ultimo_id is not None:
+                backlog, seq = self._desde_id(ultimo_id)
+                if backlog is None:
+                    yield self.reset()
+                    backlog = []
+                for evento in backlog:
+                    if evento.recurso is None or evento.recurso in recursos:
+                        yield evento
+            else:
+                with self._lock:
+                    seq = self._seq
+
+            while True:
+                sinal = self._sinais[loop]
+                pendentes = self._pendentes(seq)
+                if pendentes is None:
+                    with self._lock:
+                        seq = self._seq
+                    yield self.reset()
+                    continue
+                if not pendentes:
+                    try:
+                        await asyncio.wait_for(sinal.wait(), heartbeat)
+                    except asyncio.TimeoutError:
+                        yield None
+                    continue
+                for evento in pendentes:
+                    seq = evento.seq
+                    if evento.recurso is None or evento.recurso in recursos:
+                        yield evento
+        finally:
+            self._remover(loop)
+
+    def reset(self):
+        return Evento(0, self._ultimo_id, None, 'reset', {})
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = Broker(settings.EVENTOS['BUFFER'])
+    return _broker
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from eventos.broker import Broker
+from eventos.views import fluxo
+
+
+class Command(BaseCommand):
+    help = 'Mede o custo de conexões SSE ociosas e a latência do fan-out de eventos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--conexoes', type=int, default=5000)
+        parser.add_argument('--eventos', type=int, default=50)
+
+    def handle(self, *args, **options):
+        asyncio.run(self.medir(options['conexoes'], options['eventos']))
+
+    async def medir(self, conexoes, total_eventos):
+        broker = Broker(tamanho_buffer=max(1000, total_eventos))
+        recursos = frozenset({'cursos', 'disciplinas', 'perfis'})
+        recebidos = [0] * conexoes
+        concluidos = asyncio.Event()
+        faltando = [conexoes]
+
+        async def cliente(indice):
+            async for quadro in fluxo(recursos, None, broker):
+                if quadro.startswith(b'id:'):
+                    recebidos[indice] += 1
+                    if recebidos[indice] == total_eventos:
+                        faltando[0] -= 1
+                        if not faltando[0]:
+                            concluidos.set()
+
+        tracemalloc.start()
+        antes = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        tarefas = [asyncio.create_task(cliente(i)) for i in range(conexoes)]
+        while broker.total_assinantes < conexoes:
+            await asyncio.sleep(0.01)
+        abertura = time.perf_counter() - inicio
+        por_conexao = (tracemalloc.get_traced_memory()[0] - antes) / conexoes
+        tracemalloc.stop()
+
+        def publicar():
+            for i in range(total_eventos):
+                broker.publicar('cursos', 'update', {'id': str(i), 'ativo': True})
+
+        inicio = time.perf_counter()
+        threading.Thread(target=publicar).start()
+        await concluidos.wait()
+        fanout = time.perf_counter() - inicio
+
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+        entregas = conexoes * total_eventos
+        self.stdout.write(f'Conexões ociosas: {conexoes} abertas em {abertura:.2f}s')
+        self.stdout.write(f'Memória por conexão: {por_conexao / 1024:.2f} KiB')
+        self.stdout.write(
+            f'Fan-out: {entregas} entregas em {fanout:.3f}s '
+            f'({entregas / fanout:,.0f} entregas/s, '
+            f'{fanout / total_eventos * 1000:.2f} ms por evento)'
+        )
@@ -0,0 +1,59 @@
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+from api.escuta import OuvintePostgres
+
+from .broker import get_broker
+
+logger = logging.getLogger(__name__)
+
+
+def ponte_ativa():
+    return settings.EVENTOS['PONTE_POSTGRES']
+
+
+def notificar(using, evento):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            'SELECT pg_notify(%s, %s)',
+            [settings.EVENTOS['CANAL'], json.dumps(evento, separators=(',', ':'))]
+        )
+
+
+class PontePostgres(OuvintePostgres):
+    """Escuta ``NOTIFY`` do canal de eventos e repassa ao broker local."""
+
+    def __init__(self, using='default'):
+        super().__init__(settings.EVENTOS['CANAL'], 'eventos-ponte-postgres', using)
+
+    def conectado(self, primeira):
+        if not primeira:
+            # Eventos emitidos enquanto estávamos desconectados se perderam.
+            get_broker().publicar(None, 'reset', {})
+
+    def receber(self, payload):
+        try:
+            evento = json.loads(payload)
+            get_broker().publicar(
+                evento['recurso'], evento['tipo'], evento['dados'], id=evento['id']
+            )
+        except (ValueError, KeyError):
+            logger.warning('Notificação de evento inválida: %r', payload)
+
+
+_ponte = None
+_ponte_lock = threading.Lock()
+
+
+def iniciar_ponte():
+    global _ponte
+    if _ponte is not None or not ponte_ativa():
+        return
+    with _ponte_lock:
+        if _ponte is None:
+            _ponte = PontePostgres()
+            _ponte.start()
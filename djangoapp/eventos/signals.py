@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from cursos.models import Curso
+from disciplinas.models import Disciplina
+from perfis.models import Perfil
+
+from .broker import get_broker
+from .ponte import notificar, ponte_ativa
+
+RECURSOS = {
+    Curso: 'cursos',
+    Disciplina: 'disciplinas',
+    Perfil: 'perfis',
+}
+
+
+def emitir(recurso, tipo, instance, using='default'):
+    dados = {'id': str(instance.pk), 'ativo': instance.ativo}
+    broker = get_broker()
+    if ponte_ativa():
+        # NOTIFY é transacional: só chega aos workers após o commit.
+        notificar(using, {
+            'id': broker.proximo_id(), 'recurso': recurso, 'tipo': tipo, 'dados': dados,
+        })
+    else:
+        transaction.on_commit(
+            lambda: broker.publicar(recurso, tipo, dados), using=using
+        )
+
+
+def tipo_do_save(instance, created, update_fields):
+    if created:
+        return 'create'
+    if update_fields is not None and set(update_fields) == {'ativo'}:
+        return 'ativar' if instance.ativo else 'inativar'
+    return 'update'
+
+
+@receiver(post_save)
+def publicar_save(sender, instance, created, raw, using, update_fields, **kwargs):
+    recurso = RECURSOS.get(sender)
+    if recurso is None or raw:
+        return
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    emitir(recurso, tipo_do_save(instance, created, update_fields), instance, using)
+
+
+@receiver(post_delete)
+def publicar_delete(sender, instance, using, **kwargs):
+    recurso = RECURSOS.get(sender)
+    if recurso is not None:
+        emitir(recurso, 'delete', instance, using)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import eventos
+
+urlpatterns = [
+    path('', eventos, name='eventos'),
+]
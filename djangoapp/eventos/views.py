@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from cursos.views import CursoViewSet
+from disciplinas.views import DisciplinaViewSet
+from perfis.views import PerfilViewSet
+
+from .broker import get_broker
+from .ponte import iniciar_ponte
+
+VIEWSETS = {
+    'cursos': CursoViewSet,
+    'disciplinas': DisciplinaViewSet,
+    'perfis': PerfilViewSet,
+}
+
+
+def autenticar(request):
+    autenticacao = JWTAuthentication()
+    resultado = autenticacao.authenticate(request)
+    if resultado is not None:
+        return resultado[0]
+
+    # EventSource não permite cabeçalhos customizados; aceita o token na URL.
+    token = request.GET.get('token')
+    if token:
+        return autenticacao.get_user(autenticacao.get_validated_token(token))
+    return None
+
+
+def recursos_permitidos(user):
+    leitura = SimpleNamespace(user=user, method='GET')
+    return frozenset(
+        recurso for recurso, viewset in VIEWSETS.items()
+        if all(
+            permissao().has_permission(leitura, viewset())
+            for permissao in viewset.permission_classes
+        )
+    )
+
+
+async def fluxo(recursos, ultimo_id, broker=None):
+    broker = broker or get_broker()
+    yield b'retry: 5000\n\n'
+    async for evento in broker.assinar(
+        recursos, ultimo_id, settings.EVENTOS['HEARTBEAT']
+    ):
+        yield evento.quadro if evento is not None else b': ping\n\n'
+
+
+async def eventos(request):
+    if not isinstance(request, ASGIRequest):
+        # Em WSGI o gerador infinito seria drenado e prenderia o worker.
+        return JsonResponse(
+            {'detail': 'O fluxo de eventos exige o servidor ASGI (api.asgi).'}, status=503
+        )
+    try:
+        user = await sync_to_async(autenticar)(request)
+    except AuthenticationFailed as exc:
+        dados = exc.detail if isinstance(exc.detail, dict) else {'detail': exc.detail}
+        return JsonResponse(dados, status=401)
+    if user is None:
+        return JsonResponse(
+            {'detail': 'As credenciais de autenticação não foram fornecidas.'}, status=401
+        )
+
+    recursos = recursos_permitidos(user)
+    if not recursos:
+        return JsonResponse(
+            {'detail': 'Você não tem permissão para executar essa ação.'}, status=403
+        )
+
+    ultimo_id = request.headers.get('Last-Event-ID') or request.GET.get('ultimo_id')
+    try:
+        ultimo_id = int(ultimo_id) if ultimo_id else None
+    except ValueError:
+        ultimo_id = None
+
+    iniciar_ponte()
+    response = StreamingHttpResponse(
+        fluxo(recursos, ultimo_id), content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
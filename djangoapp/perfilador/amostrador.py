@@ -0,0 +1,208 @@
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+
+from api.ids import uuid7
+
+# Classificação da amostra pelo frame mais interno que casa com um módulo.
+CATEGORIAS = (
+    ('sql', ('django.db.', 'psycopg2')),
+    ('serializacao', ('rest_framework.serializers', 'rest_framework.fields',
+                      'rest_framework.relations')),
+    ('renderizacao', ('rest_framework.renderers', 'api.renderers', 'api.middleware')),
+)
+
+
+def rotulo(frame):
+    modulo = frame.f_globals.get('__name__', '?')
+    return f'{modulo}:{frame.f_code.co_name}'
+
+
+def categoria(pilha):
+    for nome in reversed(pilha):
+        for categoria, prefixos in CATEGORIAS:
+            if nome.startswith(prefixos):
+                return categoria
+    return 'aplicacao'
+
+
+class Amostrador(threading.Thread):
+    """Amostra a pilha de uma thread em intervalos fixos (perfil estatístico)."""
+
+    def __init__(self, thread_id, intervalo):
+        super().__init__(daemon=True, name='perfilador')
+        self.thread_id = thread_id
+        self.intervalo = intervalo
+        self.pilhas = Counter()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.thread_id)
+            pilha = []
+            while frame is not None:
+                pilha.append(rotulo(frame))
+                frame = frame.f_back
+            if pilha:
+                self.pilhas[tuple(reversed(pilha))] += 1
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+        return self.pilhas
+
+
+class Sessao:
+    """Perfil de uma requisição: amostras de pilha e tempo de cada SQL."""
+
+    def __init__(self, rotulo, intervalo, conexoes):
+        self.rotulo = rotulo
+        self.intervalo = intervalo
+        self.conexoes = list(conexoes)
+        self.consultas = {}
+        self.inicio = time.perf_counter()
+        for conexao in self.conexoes:
+            conexao.execute_wrappers.append(self.medir_sql)
+        self.amostrador = Amostrador(threading.get_ident(), intervalo)
+        self.amostrador.start()
+
+    def medir_sql(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            total, duracao = self.consultas.get(sql, (0, 0.0))
+            self.consultas[sql] = (total + 1, duracao + time.perf_counter() - inicio)
+
+    def finalizar(self, status):
+        duracao = time.perf_counter() - self.inicio
+        pilhas = self.amostrador.parar()
+        for conexao in self.conexoes:
+            conexao.execute_wrappers.remove(self.medir_sql)
+
+        categorias = Counter()
+        for pilha, total in pilhas.items():
+            categorias[categoria(pilha)] += total
+        return Captura(self.rotulo, status, duracao, self.intervalo, pilhas,
+                       categorias, self.consultas)
+
+
+class Captura:
+    def __init__(self, rotulo, status, duracao, intervalo, pilhas, categorias, consultas):
+        self.id = str(uuid7())
+        self.criado_em = time.time()
+        self.rotulo = rotulo
+        self.status = status
+        self.duracao = duracao
+        self.intervalo = intervalo
+        self.pilhas = pilhas
+        self.categorias = categorias
+        self.consultas = consultas
+
+    def resumo(self):
+        amostras = sum(self.categorias.values())
+        return {
+            'id': self.id,
+            'criado_em': self.criado_em,
+            'rotulo': self.rotulo,
+            'status': self.status,
+            'duracao_ms': round(self.duracao * 1000, 2),
+            'amostras': amostras,
+            'categorias': {
+                nome: round(total / amostras, 4) for nome, total in self.categorias.most_common()
+            } if amostras else {},
+            'sql_total': sum(total for total, _ in self.consultas.values()),
+            'sql_ms': round(sum(duracao for _, duracao in self.consultas.values()) * 1000, 2),
+        }
+
+    def detalhe(self):
+        dados = self.resumo()
+        dados['intervalo_ms'] = self.intervalo * 1000
+        dados['consultas'] = [
+            {'sql': sql, 'execucoes': total, 'ms': round(duracao * 1000, 2)}
+            for sql, (total, duracao) in sorted(
+                self.consultas.items(), key=lambda item: item[1][1], reverse=True
+            )
+        ]
+        return dados
+
+    def flamegraph(self):
+        """Formato "collapsed" (pilha;separada;por;ponto-e-vírgula contagem)."""
+        return ''.join(
+            f'{";".join(pilha)} {total}\n' for pilha, total in self.pilhas.most_common()
+        )
+
+
+class Gatilhos:
+    """Padrões armados por um Gerente, cada um válido para N requisições."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._padroes = []
+
+    def __bool__(self):
+        return bool(self._padroes)
+
+    def armar(self, padrao, quantidade):
+        with self._lock:
+            self._padroes.append([re.compile(padrao), quantidade])
+
+    def desarmar(self):
+        with self._lock:
+            self._padroes = []
+
+    def listar(self):
+        with self._lock:
+            return [
+                {'padrao': padrao.pattern, 'restantes': restantes}
+                for padrao, restantes in self._padroes
+            ]
+
+    def consumir(self, *alvos):
+        with self._lock:
+            for item in self._padroes:
+                if any(item[0].search(alvo) for alvo in alvos):
+                    item[1] -= 1
+                    if item[1] <= 0:
+                        self._padroes.remove(item)
+                    return True
+        return False
+
+
+class Capturas:
+    """Buffer circular das últimas capturas."""
+
+    def __init__(self, tamanho):
+        self._lock = threading.Lock()
+        self._itens = deque(maxlen=tamanho)
+
+    def adicionar(self, captura):
+        with self._lock:
+            self._itens.append(captura)
+
+    def listar(self):
+        with self._lock:
+            return list(reversed(self._itens))
+
+    def obter(self, id):
+        with self._lock:
+            return next((captura for captura in self._itens if captura.id == id), None)
+
+
+gatilhos = Gatilhos()
+
+_capturas = None
+_capturas_lock = threading.Lock()
+
+
+def get_capturas():
+    global _capturas
+    if _capturas is None:
+        with _capturas_lock:
+            if _capturas is None:
+                _capturas = Capturas(settings.PERFILADOR['CAPTURAS'])
+    return _capturas
@@ -0,0 +1,75 @@
+import hmac
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from .amostrador import Sessao, gatilhos, get_capturas
+
+
+class PerfiladorMiddleware:
+    """Captura um perfil amostrado das requisições armadas.
+
+    Uma requisição é perfilada quando casa com um padrão armado por um
+    Gerente (``POST /perfilador/armar/``) ou quando traz o cabeçalho
+    ``X-Perfilar`` com o segredo configurado. Sem gatilho armado e sem o
+    cabeçalho o custo é uma checagem de lista vazia por requisição, tanto em
+    WSGI quanto em ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        config = settings.PERFILADOR
+        self.segredo = config['SEGREDO'].encode()
+        self.intervalo = config['INTERVALO_MS'] / 1000
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sessao = self.iniciar(request) if self.armado(request) else None
+        response = self.get_response(request)
+        if sessao is not None:
+            self.finalizar(sessao, response)
+        return response
+
+    async def __acall__(self, request):
+        # Só as requisições armadas pagam a troca de thread: a sessão precisa
+        # nascer na thread em que a view síncrona vai rodar.
+        sessao = None
+        if self.armado(request):
+            sessao = await sync_to_async(self.iniciar)(request)
+        response = await self.get_response(request)
+        if sessao is not None:
+            await sync_to_async(self.finalizar)(sessao, response)
+        return response
+
+    def armado(self, request):
+        return bool(gatilhos) or 'HTTP_X_PERFILAR' in request.META
+
+    def iniciar(self, request):
+        rotulo = f'{request.method} {request.path}'
+        try:
+            view_func = resolve(request.path_info, getattr(request, 'urlconf', None)).func
+        except Resolver404:
+            view_func = None
+        acao = getattr(view_func, 'actions', {}).get(request.method.lower(), '')
+        basename = getattr(view_func, 'initkwargs', {}).get('basename', '')
+        if basename:
+            rotulo += f' {basename}.{acao}'
+
+        if not (self.autorizado(request) or gatilhos.consumir(rotulo)):
+            return None
+        return Sessao(rotulo, self.intervalo, connections.all())
+
+    def finalizar(self, sessao, response):
+        get_capturas().adicionar(sessao.finalizar(response.status_code))
+
+    def autorizado(self, request):
+        enviado = request.META.get('HTTP_X_PERFILAR', '').encode()
+        return bool(self.segredo) and hmac.compare_digest(enviado, self.segredo)
@@ -0,0 +1,10 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import PerfiladorViewSet
+
+router = DefaultRouter()
+router.register(r'', PerfiladorViewSet, basename='perfilador')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
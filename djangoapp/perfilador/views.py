@@ -0,0 +1,66 @@
+import re
+
+from django.http import Http404, HttpResponse
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from perfis.permissions import IsGerente
+
+from .amostrador import gatilhos, get_capturas
+
+
+class ArmarSerializer(serializers.Serializer):
+    padrao = serializers.CharField(max_length=200)
+    quantidade = serializers.IntegerField(min_value=1, max_value=1000, default=1)
+
+    def validate_padrao(self, value):
+        try:
+            re.compile(value)
+        except re.error as exc:
+            raise serializers.ValidationError(f'Expressão regular inválida: {exc}')
+        return value
+
+
+class PerfiladorViewSet(viewsets.ViewSet):
+    """Capturas de perfil amostrado.
+
+    O padrão é uma expressão regular buscada em ``"<MÉTODO> <caminho>
+    <basename>.<ação>"``, por exemplo ``disciplina.list`` ou
+    ``GET /cursos/.*/resumo/``.
+    """
+
+    permission_classes = [IsGerente]
+
+    def list(self, request):
+        return Response({
+            'gatilhos': gatilhos.listar(),
+            'capturas': [captura.resumo() for captura in get_capturas().listar()],
+        })
+
+    def retrieve(self, request, pk=None):
+        return Response(self.get_captura(pk).detalhe())
+
+    @action(detail=False, methods=['post', 'delete'])
+    def armar(self, request):
+        if request.method == 'DELETE':
+            gatilhos.desarmar()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = ArmarSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        gatilhos.armar(**serializer.validated_data)
+        return Response({'gatilhos': gatilhos.listar()}, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def flamegraph(self, request, pk=None):
+        captura = self.get_captura(pk)
+        response = HttpResponse(captura.flamegraph(), content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="perfil-{captura.id}.folded"'
+        return response
+
+    def get_captura(self, pk):
+        captura = get_capturas().obter(pk)
+        if captura is None:
+            raise Http404
+        return captura
@@ -1,12 +1,13 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from api.admin import CatalogoAdminMixin
 from .models import Perfil
 
 
 @admin.register(Perfil)
-class PerfilAdmin(UserAdmin):
+class PerfilAdmin(CatalogoAdminMixin, UserAdmin):
     list_display = ('codigo', 'nome', 'email', 'tipo', 'ativo', 'date_joined')
-    list_filter = ('tipo', 'ativo', 'date_joined')
+    list_filter = ('tipo', 'ativo')
     search_fields = ('codigo', 'nome', 'email')
     ordering = ('codigo',)
 
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('perfis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='perfil',
+            index=models.Index(condition=models.Q(('ativo', True)), fields=['-date_joined'], name='perfis_date_joined_ativos_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 19:17
+
+import api.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perfis', '0002_indices_ativos'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='perfil',
+            name='id',
+            field=models.UUIDField(default=api.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
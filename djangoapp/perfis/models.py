@@ -1,17 +1,19 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
-import uuid
 from datetime import datetime
+from api.ids import uuid7
+from api.integridade import RestricoesMixin
+from api.transicoes import alterar_ativo
 
 
-class Perfil(AbstractUser):
+class Perfil(RestricoesMixin, AbstractUser):
     TIPO_CHOICES = [
         ('Gerente', 'Gerente'),
         ('Professor', 'Professor'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     codigo = models.CharField(max_length=50, unique=True, blank=True)
     nome = models.CharField(max_length=255)
     tipo = models.CharField(max_length=20, choices=TIPO_CHOICES)
@@ -29,6 +31,12 @@ class Perfil(AbstractUser):
         db_table = 'perfis'
         verbose_name = 'Perfil'
         verbose_name_plural = 'Perfis'
+        indexes = [
+            models.Index(
+                fields=['-date_joined'], name='perfis_date_joined_ativos_idx',
+                condition=models.Q(ativo=True)
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.codigo:
@@ -45,6 +53,9 @@ class Perfil(AbstractUser):
 
             self.codigo = f'MAT.{ano_atual}.{proximo_numero}'
 
+        super().save(*args, **kwargs)
+
+    def validar_restricoes(self):
         existing = Perfil.objects.filter(
             codigo=self.codigo,
             ativo=True
@@ -53,7 +64,18 @@ class Perfil(AbstractUser):
         if existing.exists():
             raise ValidationError(f'Já existe um perfil ativo com o código {self.codigo}')
 
-        super().save(*args, **kwargs)
+        self.validate_unique()
+
+    @classmethod
+    def alterar_ativo(cls, pk, ativo, queryset=None):
+        return alterar_ativo(
+            cls, pk, ativo,
+            guarda=(
+                'NOT EXISTS (SELECT 1 FROM perfis o '
+                'WHERE o.codigo = t.codigo AND o.ativo AND o.id <> t.id)'
+            ),
+            queryset=queryset,
+        )
 
     def __str__(self):
         return f'{self.codigo} - {self.nome}'
\ No newline at end of file
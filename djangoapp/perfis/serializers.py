@@ -14,11 +14,12 @@ class PerfilSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'password': {'write_only': True},
             'codigo': {'read_only': True},
+            'email': {'validators': []},
         }
 
     def create(self, validated_data):
         password = validated_data.pop('password')
-        perfil = Perfil.objects.create(**validated_data)
+        perfil = Perfil(**validated_data)
         perfil.set_password(password)
         perfil.save()
         return perfil
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Tarefa
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'status', 'progresso', 'tentativas', 'criado_por', 'criado_em', 'concluido_em')
+    list_filter = ('status', 'tipo')
+    list_select_related = ('criado_por',)
+    raw_id_fields = ('criado_por',)
+    ordering = ('-criado_em',)
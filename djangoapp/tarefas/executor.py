@@ -0,0 +1,111 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Tarefa
+
+logger = logging.getLogger(__name__)
+
+OPERACOES = {}
+
+
+class TarefaFalhou(Exception):
+    """Erro definitivo: a tarefa falha sem novas tentativas."""
+
+
+def operacao(tipo):
+    def registrar(funcao):
+        OPERACOES[tipo] = funcao
+        return funcao
+    return registrar
+
+
+def enfileirar(tipo, parametros, usuario=None, max_tentativas=None):
+    if tipo not in OPERACOES:
+        raise LookupError(f'Tipo de tarefa desconhecido: {tipo}')
+    return Tarefa.objects.create(
+        tipo=tipo,
+        parametros=parametros,
+        criado_por=usuario if usuario is not None and usuario.is_authenticated else None,
+        max_tentativas=max_tentativas or settings.TAREFAS['MAX_TENTATIVAS'],
+    )
+
+
+def reservar(trabalhador):
+    """Reserva a próxima tarefa pendente com ``FOR UPDATE SKIP LOCKED``.
+
+    Workers concorrentes nunca esperam um pelo outro nem pegam a mesma linha.
+    """
+    with transaction.atomic():
+        tarefa = (
+            Tarefa.objects.select_for_update(skip_locked=True)
+            .filter(status=Tarefa.PENDENTE, executar_apos__lte=timezone.now())
+            .order_by('executar_apos')
+            .first()
+        )
+        if tarefa is None:
+            return None
+        tarefa.status = Tarefa.EXECUTANDO
+        tarefa.tentativas += 1
+        tarefa.trabalhador = trabalhador
+        tarefa.iniciado_em = timezone.now()
+        tarefa.save(update_fields=[
+            'status', 'tentativas', 'trabalhador', 'iniciado_em', 'atualizado_em'
+        ])
+    return tarefa
+
+
+def executar(tarefa):
+    try:
+        funcao = OPERACOES.get(tarefa.tipo)
+        if funcao is None:
+            raise TarefaFalhou(f'Tipo de tarefa desconhecido: {tarefa.tipo}')
+        resultado = funcao(tarefa, **tarefa.parametros)
+    except Exception as exc:
+        logger.exception('Tarefa %s (%s) falhou', tarefa.pk, tarefa.tipo)
+        agora = timezone.now()
+        erro = str(exc) if isinstance(exc, TarefaFalhou) else traceback.format_exc()
+        tarefas = Tarefa.objects.filter(pk=tarefa.pk)
+        if isinstance(exc, TarefaFalhou) or tarefa.tentativas >= tarefa.max_tentativas:
+            tarefas.update(
+                status=Tarefa.FALHOU, erro=erro, concluido_em=agora, atualizado_em=agora
+            )
+        else:
+            espera = settings.TAREFAS['ESPERA_RETENTATIVA'] * 2 ** (tarefa.tentativas - 1)
+            tarefas.update(
+                status=Tarefa.PENDENTE, erro=erro, trabalhador='', atualizado_em=agora,
+                executar_apos=agora + timedelta(seconds=espera),
+            )
+        return
+
+    agora = timezone.now()
+    Tarefa.objects.filter(pk=tarefa.pk).update(
+        status=Tarefa.CONCLUIDA, progresso=1, resultado=resultado, erro='',
+        concluido_em=agora, atualizado_em=agora,
+    )
+
+
+def sinalizar(prefixo):
+    """Renova ``atualizado_em`` das tarefas em execução por este processo."""
+    Tarefa.objects.filter(
+        status=Tarefa.EXECUTANDO, trabalhador__startswith=prefixo
+    ).update(atualizado_em=timezone.now())
+
+
+def recuperar_travadas():
+    """Devolve à fila tarefas de workers que morreram no meio da execução."""
+    agora = timezone.now()
+    travadas = Tarefa.objects.filter(
+        status=Tarefa.EXECUTANDO,
+        atualizado_em__lt=agora - timedelta(seconds=settings.TAREFAS['TIMEOUT']),
+    )
+    travadas.filter(tentativas__gte=F('max_tentativas')).update(
+        status=Tarefa.FALHOU, erro='Worker interrompido durante a execução.',
+        concluido_em=agora, atualizado_em=agora,
+    )
+    return travadas.update(status=Tarefa.PENDENTE, trabalhador='', atualizado_em=agora)
@@ -0,0 +1,75 @@
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+
+from tarefas.executor import executar, recuperar_travadas, reservar, sinalizar
+
+
+class Command(BaseCommand):
+    help = 'Executa as tarefas em segundo plano (fila em tabela, FOR UPDATE SKIP LOCKED).'
+
+    def add_arguments(self, parser):
+        config = settings.TAREFAS
+        parser.add_argument('--concorrencia', type=int, default=config['CONCORRENCIA'])
+        parser.add_argument('--intervalo', type=float, default=config['INTERVALO'],
+                            help='Segundos de espera quando a fila está vazia.')
+        parser.add_argument('--uma-vez', action='store_true',
+                            help='Encerra quando não houver mais tarefas pendentes.')
+
+    def handle(self, *args, **options):
+        self.parar = threading.Event()
+        self.prefixo = f'{socket.gethostname()}:{os.getpid()}:'
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sinal, lambda *_: self.parar.set())
+
+        threads = [
+            threading.Thread(
+                target=self.trabalhar, args=(f'{self.prefixo}{numero}', options),
+                name=f'tarefas-{numero}',
+            )
+            for numero in range(options['concorrencia'])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f'{len(threads)} worker(s) aguardando tarefas.')
+
+        intervalo_sinal = settings.TAREFAS['TIMEOUT'] / 3
+        while any(thread.is_alive() for thread in threads):
+            if self.parar.wait(intervalo_sinal):
+                break
+            try:
+                sinalizar(self.prefixo)
+                recuperadas = recuperar_travadas()
+            except DatabaseError as exc:
+                self.stderr.write(f'Falha ao sinalizar tarefas: {exc}')
+                continue
+            if recuperadas:
+                self.stdout.write(f'{recuperadas} tarefa(s) travada(s) devolvida(s) à fila.')
+        for thread in threads:
+            thread.join()
+        connection.close()
+
+    def trabalhar(self, trabalhador, options):
+        try:
+            while not self.parar.is_set():
+                try:
+                    tarefa = reservar(trabalhador)
+                except DatabaseError as exc:
+                    self.stderr.write(f'{trabalhador}: {exc}')
+                    connection.close()
+                    tarefa = None
+                if tarefa is None:
+                    if options['uma_vez']:
+                        break
+                    self.parar.wait(options['intervalo'])
+                    continue
+
+                self.stdout.write(f'{trabalhador}: {tarefa.tipo} {tarefa.pk}')
+                executar(tarefa)
+        finally:
+            connection.close()
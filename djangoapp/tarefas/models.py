@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from api.ids import uuid7
+
+
+class Tarefa(models.Model):
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDA = 'concluida'
+    FALHOU = 'falhou'
+
+    STATUS_CHOICES = [
+        (PENDENTE, 'Pendente'),
+        (EXECUTANDO, 'Executando'),
+        (CONCLUIDA, 'Concluída'),
+        (FALHOU, 'Falhou'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    tipo = models.CharField(max_length=100)
+    parametros = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDENTE)
+    progresso = models.FloatField(default=0)
+    mensagem = models.CharField(max_length=255, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    erro = models.TextField(blank=True)
+    tentativas = models.PositiveIntegerField(default=0)
+    max_tentativas = models.PositiveIntegerField(default=3)
+    executar_apos = models.DateTimeField(default=timezone.now)
+    trabalhador = models.CharField(max_length=100, blank=True)
+    criado_por = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='tarefas'
+    )
+    criado_em = models.DateTimeField(auto_now_add=True)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'tarefas'
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        indexes = [
+            models.Index(
+                fields=['executar_apos'], name='tarefas_pendentes_idx',
+                condition=models.Q(status='pendente')
+            ),
+        ]
+
+    def reportar(self, progresso, mensagem=''):
+        """Grava o progresso (0 a 1); também serve de sinal de vida do worker."""
+        self.progresso = progresso
+        self.mensagem = mensagem[:255]
+        Tarefa.objects.filter(pk=self.pk).update(
+            progresso=progresso, mensagem=self.mensagem, atualizado_em=timezone.now()
+        )
+
+    def __str__(self):
+        return f'{self.tipo} ({self.get_status_display()})'
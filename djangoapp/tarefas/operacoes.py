@@ -0,0 +1,110 @@
+import csv
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.module_loading import import_string
+from django_filters.rest_framework import DjangoFilterBackend
+
+from api.ids import uuid7
+from api.transicoes import alterar_ativo_em_lote
+from cursos.importacao import ArquivoInvalido, ImportacaoCatalogo
+
+from .executor import TarefaFalhou, operacao
+
+LOTE = 1000
+
+EXTENSOES = ('.csv', '.ndjson', '.jsonl')
+
+
+def diretorio():
+    caminho = settings.TAREFAS['DIRETORIO']
+    caminho.mkdir(parents=True, exist_ok=True)
+    return caminho
+
+
+def filtrar(recurso, filtros=None, ids=None):
+    """Reaplica no worker os filtros da listagem do ViewSet ``recurso``."""
+    viewset = import_string(recurso)
+    queryset = viewset.queryset.all()
+    if filtros:
+        filterset_class = DjangoFilterBackend().get_filterset_class(viewset(), queryset)
+        filterset = filterset_class(filtros, queryset=queryset)
+        if not filterset.is_valid():
+            raise TarefaFalhou(f'Filtros inválidos: {dict(filterset.errors)}')
+        queryset = filterset.qs
+    if ids:
+        queryset = queryset.filter(pk__in=ids)
+    return queryset
+
+
+@operacao('alterar_ativo_em_lote')
+def alterar_ativo(tarefa, recurso, ativo, filtros=None, ids=None):
+    queryset = filtrar(recurso, filtros, ids).exclude(ativo=ativo)
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+    alterados = 0
+    for inicio in range(0, len(pks), LOTE):
+        try:
+            with transaction.atomic():
+                alterados += len(alterar_ativo_em_lote(
+                    queryset.model.objects.filter(pk__in=pks[inicio:inicio + LOTE]), ativo
+                ))
+        except IntegrityError as exc:
+            raise TarefaFalhou(
+                f'{str(exc).splitlines()[0]} ({alterados} registros já alterados)'
+            )
+        tarefa.reportar(
+            min(1, (inicio + LOTE) / len(pks)), f'{alterados} de {len(pks)} registros'
+        )
+    return {'alterados': alterados}
+
+
+@operacao('exportar_csv')
+def exportar_csv(tarefa, recurso, campos, filtros=None, ids=None):
+    queryset = filtrar(recurso, filtros, ids)
+    total = queryset.count()
+    nome = f'{tarefa.pk}.csv'
+    linhas = 0
+    with open(diretorio() / nome, 'w', encoding='utf-8', newline='') as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow([campo.replace('__', '_') for campo in campos])
+        for linha in queryset.order_by('pk').values_list(*campos).iterator(chunk_size=LOTE):
+            escritor.writerow(linha)
+            linhas += 1
+            if linhas % (LOTE * 10) == 0:
+                tarefa.reportar(linhas / total, f'{linhas} de {total} linhas')
+    return {'arquivo': nome, 'linhas': linhas}
+
+
+@operacao('importar_catalogo')
+def importar_catalogo(tarefa, arquivos, dry_run=False):
+    nome_rejeitos = f'{tarefa.pk}-rejeitos.csv'
+    with ExitStack() as pilha:
+        abertos = {
+            tipo: pilha.enter_context(open(diretorio() / nome, 'rb'))
+            for tipo, nome in arquivos.items()
+        }
+        rejeitos = pilha.enter_context(
+            open(diretorio() / nome_rejeitos, 'w', encoding='utf-8', newline='')
+        )
+        tarefa.reportar(0, 'Carregando arquivos')
+        try:
+            estatisticas = ImportacaoCatalogo(rejeitos=rejeitos, dry_run=dry_run).executar(**abertos)
+        except ArquivoInvalido as exc:
+            raise TarefaFalhou(str(exc))
+
+    if estatisticas['rejeitadas']:
+        estatisticas['arquivo'] = nome_rejeitos
+    else:
+        (diretorio() / nome_rejeitos).unlink()
+    return estatisticas
+
+
+def salvar_upload(upload, tipo):
+    extensao = Path(upload.name).suffix.lower()
+    nome = f'{uuid7()}-{tipo}{extensao if extensao in EXTENSOES else ".csv"}'
+    with open(diretorio() / nome, 'wb') as destino:
+        for pedaco in upload.chunks():
+            destino.write(pedaco)
+    return nome
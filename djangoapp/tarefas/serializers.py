@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from .models import Tarefa
+
+
+class TarefaSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Tarefa
+        fields = [
+            'id', 'tipo', 'parametros', 'status', 'progresso', 'mensagem',
+            'resultado', 'erro', 'tentativas', 'max_tentativas', 'criado_por',
+            'criado_em', 'iniciado_em', 'atualizado_em', 'concluido_em'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,10 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import TarefaViewSet
+
+router = DefaultRouter()
+router.register(r'', TarefaViewSet, basename='tarefa')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
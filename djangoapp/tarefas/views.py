@@ -0,0 +1,26 @@
+from django.http import FileResponse, Http404
+from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from django_filters.rest_framework import DjangoFilterBackend
+from .models import Tarefa
+from .operacoes import diretorio
+from .serializers import TarefaSerializer
+from perfis.permissions import IsGerente
+
+
+class TarefaViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Tarefa.objects.all()
+    serializer_class = TarefaSerializer
+    permission_classes = [IsGerente]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status', 'tipo']
+    ordering_fields = ['criado_em', 'concluido_em']
+    ordering = ['-criado_em']
+
+    @action(detail=True, methods=['get'])
+    def arquivo(self, request, pk=None):
+        tarefa = self.get_object()
+        nome = (tarefa.resultado or {}).get('arquivo')
+        if not nome or not (diretorio() / nome).is_file():
+            raise Http404
+        return FileResponse(open(diretorio() / nome, 'rb'), as_attachment=True, filename=nome)
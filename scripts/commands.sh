@@ -9,6 +9,8 @@ collectstatic.sh
 makemigrations.sh
 migrate.sh
 
+python manage.py gerar_schema
+
 python create_initial_data.py
 
 runserver.sh
\ No newline at end of file
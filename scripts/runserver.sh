@@ -1,3 +1,3 @@
 #!/bin/sh
 ./venv/bin/activate
-exec python /djangoapp/manage.py runserver 0.0.0.0:8000
+exec uvicorn api.asgi:application --app-dir /djangoapp